@@ -52,14 +52,15 @@ bl_info = {
 import bpy
 import bmesh
 import math
-import enum
 import traceback
 import numpy
-from bpy.types import Operator, Macro, AddonPreferences
+from bpy.types import Operator, AddonPreferences
 from bpy.app.handlers import persistent
-from mathutils import Euler, Vector, Matrix, Quaternion
+from mathutils import Vector, Matrix
 from mathutils.geometry import intersect_plane_plane
 from operator import attrgetter
+from functools import cache
+from itertools import chain
 
 
 ###############################################################################
@@ -70,18 +71,17 @@ from operator import attrgetter
 RUNNING_AS_SCRIPT = (__name__ == "__main__")
 PACKAGE_NAME = (__package__ if __package__ is not None else "blender-nail")
 
-face_vec3_getter = attrgetter("faces.layers.float_vector")
-# float_color is the only vec4 attribute accessible by BMesh >:(
-face_vec4_getter = attrgetter("faces.layers.float_color")
-
 ATTRS = {
     # ShiftFlags and ScaleRot each combine two pieces of data into one attribute.
     # This is because bmesh doesn't support accessing a per-face 2D Vector attribute,
     # so just storing shift or scale separately would leave the z coord unused.
-    "Nail_ShiftFlags":     ('FACE', 'FLOAT_VECTOR', face_vec3_getter, 'shift_flags_layer'),
-    "Nail_ScaleRot":       ('FACE', 'FLOAT_VECTOR', face_vec3_getter, 'scale_rot_layer'),
-    "Nail_LockUAxis":      ('FACE', 'FLOAT_VECTOR', face_vec3_getter, 'lock_uaxis_layer'),
-    "Nail_LockVAxis":      ('FACE', 'FLOAT_VECTOR', face_vec3_getter, 'lock_vaxis_layer'),
+    # The third item is the name of the BMesh face layer collection the attribute
+    # is in (bm.faces.layers.<name>). Vec3 attributes are in 'float_vector'.
+    # (float_color is the only vec4 attribute accessible by BMesh >:( )
+    "Nail_ShiftFlags":     ('FACE', 'FLOAT_VECTOR', 'float_vector', 'shift_flags_layer'),
+    "Nail_ScaleRot":       ('FACE', 'FLOAT_VECTOR', 'float_vector', 'scale_rot_layer'),
+    "Nail_LockUAxis":      ('FACE', 'FLOAT_VECTOR', 'float_vector', 'lock_uaxis_layer'),
+    "Nail_LockVAxis":      ('FACE', 'FLOAT_VECTOR', 'float_vector', 'lock_vaxis_layer'),
 }
 
 VEC3_ATTR_DEFAULT = Vector((0,0,0)).freeze()
@@ -99,8 +99,11 @@ TCFLAG_ALIGN_LOCKED = 8   # True for manual alignment of UX axes. Cannot be comb
 
 TCFLAG_ALL = TCFLAG_ENABLED | TCFLAG_OBJECT_SPACE | TCFLAG_ALIGN_FACE | TCFLAG_ALIGN_LOCKED
 
+# Cached, since the classes are fixed once the module is loaded. (Not a plain
+# constant because it has to be defined before the classes it refers to.)
+@cache
 def nail_classes():
-    return [
+    return (
         AURYCAT_OT_nail_unregister,
         NailPreferences,
         AURYCAT_OT_nail_sleep,
@@ -125,7 +128,8 @@ def nail_classes():
         AURYCAT_OT_nail_internal_end_locked_translate,
         AURYCAT_OT_nail_internal_end_locked_rotate,
         AURYCAT_OT_nail_internal_end_locked_scale,
-    ]
+        AURYCAT_OT_nail_cancel_locked_transform,
+    )
 
 
 ###############################################################################
@@ -147,8 +151,8 @@ def register():
             raise RuntimeError("Nail is already registered! Run bpy.ops.aurycat.nail_unregister() in the Python Console or restart Blender.")
 
     try:
-        for cls in nail_classes():
-            bpy.utils.register_class(cls)
+        register_classes, _ = bpy.utils.register_classes_factory(nail_classes())
+        register_classes()
 
         AURYCAT_OT_nail_internal_modal_locked_transform.active = None
 
@@ -169,15 +173,23 @@ def register():
 def unregister():
     global nail_is_awake
     nail_is_awake = False
-    no_except(lambda: set_post_register_handler_enabled(False))
-    no_except(lambda: set_post_load_handler_enabled(False))
-    no_except(lambda: enable_post_depsgraph_update_handler(False))
-    no_except(lambda: bpy.types.VIEW3D_PT_view3d_lock.remove(draw_lock_rotation))
-    no_except(lambda: bpy.types.VIEW3D_MT_editor_menus.remove(nail_draw_main_menu))
-    no_except(lambda: remove_keymaps())
+    no_except(set_post_register_handler_enabled, False)
+    no_except(set_post_load_handler_enabled, False)
+    no_except(enable_post_depsgraph_update_handler, False)
+    no_except(bpy.types.VIEW3D_PT_view3d_lock.remove, draw_lock_rotation)
+    no_except(bpy.types.VIEW3D_MT_editor_menus.remove, nail_draw_main_menu)
+    no_except(remove_keymaps)
+    if bpy.app.timers.is_registered(locked_transform_watchdog):
+        bpy.app.timers.unregister(locked_transform_watchdog)
     disable_debug_draw()
-    for cls in nail_classes():
-        no_except(lambda: bpy.utils.unregister_class(cls))
+    scratch_buffers.clear()
+    nail_prefs_cache.clear()
+    # Not using register_classes_factory's unregister, since this is also used
+    # to clean up after a failed register(), where only some classes may have
+    # been registered. Checking is_registered avoids raising for the rest.
+    for cls in reversed(nail_classes()):
+        if cls.is_registered:
+            no_except(bpy.utils.unregister_class, cls)
 
 
 class AURYCAT_OT_nail_unregister(Operator):
@@ -218,6 +230,9 @@ def set_post_register_handler_enabled(enable):
 
 @persistent
 def on_post_load(path):
+    nail_prefs_cache.clear()
+    on_post_depsgraph_update.pending_obj_set.clear()
+    apply_pending_objects.last_errors.clear()
     if any_nail_meshes():
         nail_wake()
     else:
@@ -246,11 +261,14 @@ def on_post_register(scene, depsgraph):
             on_post_depsgraph_update(scene, depsgraph)
 
 
+# Run on every file load. Most files don't use Nail at all, and for those it's
+# enough to look at each mesh once, rather than at each object (and its mesh).
+# Only if some mesh is a NailMesh are the objects scanned to find one using it.
+# (Same as NailMesh.is_nail_object, inlined since it runs for every object.)
 def any_nail_meshes():
-    for obj in bpy.data.objects:
-        if NailMesh.is_nail_object(obj):
-            return True
-    return False
+    if not any(NailMesh.is_nail_mesh(me) for me in bpy.data.meshes):
+        return False
+    return any(obj.type == 'MESH' and NailMesh.is_nail_mesh(obj.data) for obj in bpy.data.objects)
 
 
 def nail_wake_if_needed():
@@ -282,9 +300,11 @@ def nail_sleep():
     print("** Nail addon sleep")
     nail_is_awake = False
 
-    no_except(lambda: enable_post_depsgraph_update_handler(False))
-    no_except(lambda: remove_keymaps())
+    no_except(enable_post_depsgraph_update_handler, False)
+    no_except(remove_keymaps)
     disable_debug_draw()
+    scratch_buffers.clear()
+    nail_prefs_cache.clear()
 
 
 class AURYCAT_OT_nail_sleep(Operator):
@@ -315,7 +335,18 @@ def use_locked_transform_keymaps_updated(self, context):
     if nail_is_awake and (GR or S):
         add_keymaps(GR, S)
     else:
-        no_except(lambda: remove_keymaps())
+        no_except(remove_keymaps)
+
+# The preferences NailMesh reads every time it's opened, which the depsgraph
+# handler does for every update during e.g. a modal Move. Each
+# NailPreferences.get goes through several RNA lookups, so they're cached here
+# (see NailPreferences.get_cached) until one of them changes, or Nail goes to
+# sleep or is unregistered. (Loading or reverting the preferences doesn't run
+# the update callbacks.)
+nail_prefs_cache = {}
+
+def nail_prefs_cache_updated(self, context):
+    nail_prefs_cache.clear()
 
 def visualize_uv_axes_updated(self, context):
     if nail_is_awake and NailPreferences.get('debug_visualize_uv_axes'):
@@ -343,7 +374,8 @@ class NailPreferences(AddonPreferences):
     wrap_uvs: bpy.props.BoolProperty(
         name="Wrap UVs",
         description="If checked, each face's UV island is wrapped to be near (0,0) in UV space. Otherwise, UVs are projected literally from world-space coordinates, meaning the UVs can be very far from (0,0) if the face is far from the world origin",
-        default=True)
+        default=True,
+        update=nail_prefs_cache_updated)
 
     use_locked_transform_keymap_GR: bpy.props.BoolProperty(
         name="Use Texture-Locked G & R Keymaps",
@@ -366,8 +398,8 @@ class NailPreferences(AddonPreferences):
     # These are used to globally persist the properties of the same names in
     # the Edit Texture operator. Not viewable in the Preferences section.
     # See AURYCAT_OT_nail_edit_texture_config for more info.
-    snap_to_pixels: bpy.props.BoolProperty(default=False)
-    snap_step: bpy.props.IntVectorProperty(default=[1,1],size=2,min=0)
+    snap_to_pixels: bpy.props.BoolProperty(default=False, update=nail_prefs_cache_updated)
+    snap_step: bpy.props.IntVectorProperty(default=[1,1],size=2,min=0, update=nail_prefs_cache_updated)
 
     @classmethod
     def get(cls, name):
@@ -377,6 +409,21 @@ class NailPreferences(AddonPreferences):
             # Try to get the default value of the property
             return cls.__annotations__[name].keywords['default']
 
+    # Same as get, for the preferences with nail_prefs_cache_updated as their
+    # update callback
+    @classmethod
+    def get_cached(cls, name):
+        if name not in nail_prefs_cache:
+            value = cls.get(name)
+            # Vector properties (snap_step) come back as an array that still
+            # points into the preferences, so keep a copy instead
+            try:
+                value = tuple(value)
+            except TypeError:
+                pass
+            nail_prefs_cache[name] = value
+        return nail_prefs_cache[name]
+
     def draw(self, context):
         layout = self.layout
         auto_apply = NailPreferences.get('auto_apply')
@@ -402,12 +449,18 @@ class NailPreferences(AddonPreferences):
 ##################################  Keymaps  ##################################
 ###############################################################################
 
+# Cached like nail_classes
+@cache
 def keymapped_ops():
-    return [
+    return (
         {'idname': AURYCAT_OT_nail_keybind_modal_locked_translate.bl_idname, 'type': 'G', 'value': 'PRESS'},
         {'idname': AURYCAT_OT_nail_keybind_modal_locked_rotate.bl_idname, 'type': 'R', 'value': 'PRESS'},
         {'idname': AURYCAT_OT_nail_keybind_modal_locked_scale.bl_idname, 'type': 'S', 'value': 'PRESS'},
-    ]
+    )
+
+@cache
+def keymapped_op_names():
+    return frozenset(op['idname'] for op in keymapped_ops())
 
 
 def add_keymaps(GR, S):
@@ -425,15 +478,18 @@ def add_keymaps(GR, S):
 def remove_keymaps():
     wm = bpy.context.window_manager
     kc = wm.keyconfigs.addon
-    keymapped_op_names = [op['idname'] for op in keymapped_ops()]
     if kc:
         km = kc.keymaps.new(name='Mesh', space_type='EMPTY')
-        to_remove = []
-        for name, kmi in km.keymap_items.items():
-            if name in keymapped_op_names:
-                to_remove.append(kmi)
-        for kmi in to_remove:
-            km.keymap_items.remove(kmi)
+        # add_keymaps adds each op at most once, so stop looking once they've
+        # all been removed. Going backwards means removing an item doesn't
+        # shift the ones still to be visited.
+        remaining = set(keymapped_op_names())
+        for kmi in reversed(km.keymap_items):
+            if kmi.idname in remaining:
+                remaining.discard(kmi.idname)
+                km.keymap_items.remove(kmi)
+                if not remaining:
+                    break
 
 
 ###############################################################################
@@ -479,6 +535,10 @@ class AURYCAT_MT_nail_main_menu(bpy.types.Menu):
         layout.operator(AURYCAT_OT_nail_modal_locked_translate.bl_idname)
         layout.operator(AURYCAT_OT_nail_modal_locked_rotate.bl_idname)
         layout.operator(AURYCAT_OT_nail_modal_locked_scale.bl_idname)
+        # Only shown while one is (supposedly) running, which, with the menu
+        # open, means it got stuck; see locked_transform_watchdog
+        if AURYCAT_OT_nail_internal_modal_locked_transform.active is not None:
+            layout.operator(AURYCAT_OT_nail_cancel_locked_transform.bl_idname)
         prefs = bpy.context.preferences.addons[PACKAGE_NAME].preferences
         layout.prop(prefs, 'use_locked_transform_keymap_GR')
         layout.prop(prefs, 'use_locked_transform_keymap_S')
@@ -489,16 +549,6 @@ class AURYCAT_MT_nail_main_menu(bpy.types.Menu):
         if RUNNING_AS_SCRIPT:
             layout.operator(AURYCAT_OT_nail_unregister.bl_idname)
 
-        # As a saftey check to make sure this hacky modal operator can't get
-        # too off the rails! If somehow our menu is opened, surely the operator
-        # should be cancelled.
-        if AURYCAT_OT_nail_internal_modal_locked_transform.active is not None:
-            # Check for ReferenceError because 'active' may be non-None but an invalid/destroyed bpy_struct
-            try:
-                AURYCAT_OT_nail_internal_modal_locked_transform.active.cancelled = True
-            except ReferenceError:
-                AURYCAT_OT_nail_internal_modal_locked_transform.active = None
-
 
 ###############################################################################
 ############################  Auto-apply handler  #############################
@@ -506,6 +556,15 @@ class AURYCAT_MT_nail_main_menu(bpy.types.Menu):
 
 def enable_post_depsgraph_update_handler(enable):
     set_handler_enabled(bpy.app.handlers.depsgraph_update_post, on_post_depsgraph_update, enable)
+    # The timer runs for as long as the handler is enabled, rather than being
+    # registered and unregistered from within the handler over and over.
+    if enable:
+        if not bpy.app.timers.is_registered(geom_update_timer):
+            bpy.app.timers.register(geom_update_timer, persistent=True)
+    else:
+        if bpy.app.timers.is_registered(geom_update_timer):
+            bpy.app.timers.unregister(geom_update_timer)
+        on_post_depsgraph_update.pending_obj_set.clear()
 
 
 # https://blender.stackexchange.com/a/283286/154191
@@ -526,11 +585,20 @@ def on_post_depsgraph_update(scene, depsgraph):
         except ReferenceError:
             AURYCAT_OT_nail_internal_modal_locked_transform.active = None
 
+    # Only updated objects can be applicable (see depsgraph_update_applicable_object).
+    # Asking the depsgraph is much cheaper than going through depsgraph.updates
+    # in Python, which matters for the many updates that don't involve any
+    # objects, e.g. editing materials or node trees.
+    objects_updated = depsgraph.id_type_updated('OBJECT')
+
     # For ~0 update_interval, do the apply every depsgraph update
     if self.update_interval < 0.04:
-        for u in depsgraph.updates:
-            if depsgraph_update_is_applicable(u):
-                do_auto_apply(u.id)
+        if objects_updated:
+            # The same object can show up more than once per update; only apply once
+            objs = {depsgraph_update_applicable_object(u) for u in depsgraph.updates}
+            objs.discard(None)
+            for obj in objs:
+                do_auto_apply(obj)
         return
 
     op = bpy.context.active_operator
@@ -539,61 +607,131 @@ def on_post_depsgraph_update(scene, depsgraph):
 
     any_geom_updates = False
 
-    for u in depsgraph.updates:
-        if depsgraph_update_is_applicable(u):
-            if not any_geom_updates:
-                any_geom_updates = True
-                self.last_obj_list.clear()
-            self.last_obj_list.append(u.id.original)
-
-    if any_geom_updates:
-        if op_changed:
-            # Operator change indicates the user probably just completed an action,
-            # like finished a Move, mode-switch, etc. We can cancel any timers and
-            # update the objects now. Unfortunately sometimes (seemingly randomly)
-            # modal operations like Move don't send a depsgraph event at the end with
-            # an updated Operator, therefore we won't see an op_changed and we can't
-            # tell the modal operation has ended. In that case, the timer below will
-            # apply the tex transform ~1 second later.
-            if bpy.app.timers.is_registered(geom_update_timer):
-                bpy.app.timers.unregister(geom_update_timer)
-            for obj in self.last_obj_list:
-                do_auto_apply(obj)
-        else:
-            # Operator was the same as last time. Start a timer to update every second.
-            # Note that during a modal operation like Move, on_post_depsgraph_update
-            # will be called constantly, so the instant the timer fires and self-
-            # unregisters, this will register it again (if the modal operation is
-            # still ongoing).
-            if not bpy.app.timers.is_registered(geom_update_timer):
-                bpy.app.timers.register(geom_update_timer, first_interval=self.update_interval)
+    for u in (depsgraph.updates if objects_updated else ()):
+        obj = depsgraph_update_applicable_object(u)
+        if obj is not None:
+            obj = obj.original
+            any_geom_updates = True
+            # A set, so an object updated many times before the timer fires is only applied once
+            self.pending_obj_set.add(obj)
+
+    if any_geom_updates and op_changed:
+        # Operator change indicates the user probably just completed an action,
+        # like finished a Move, mode-switch, etc. We can update the objects now.
+        # Unfortunately sometimes (seemingly randomly) modal operations like Move
+        # don't send a depsgraph event at the end with an updated Operator,
+        # therefore we won't see an op_changed and we can't tell the modal
+        # operation has ended. In that case, geom_update_timer will apply the
+        # tex transform on its next tick.
+        apply_pending_objects()
+    # Otherwise, the operator was the same as last time (e.g. during a modal
+    # operation like Move, this handler is called constantly). The pending
+    # objects are applied by geom_update_timer, every update_interval seconds.
 
 
 on_post_depsgraph_update.update_interval = 0
 on_post_depsgraph_update.last_operator = None
-on_post_depsgraph_update.last_obj_list = []
+on_post_depsgraph_update.pending_obj_set = set()
 on_post_depsgraph_update.timer_ran = False
 
-def depsgraph_update_is_applicable(u):
+# Returns the (evaluated) object of a depsgraph update if it's a NailMesh object
+# whose transform or geometry was updated, otherwise None. Called for every
+# update during e.g. a modal Move. Each access of u.id goes through RNA and
+# creates a new Python object, so it's only looked up once, here, and the
+# callers use the returned object instead of looking it up again.
+def depsgraph_update_applicable_object(u):
     if not u.is_updated_transform and not u.is_updated_geometry:
-        return False
-    if u.id is None or u.id.id_type != 'OBJECT' or u.id.type != 'MESH':
-        return False
-    if not NailMesh.is_nail_mesh(u.id.data):
-        return False
-    return True
+        return None
+    obj = u.id
+    if obj is None or obj.id_type != 'OBJECT' or obj.type != 'MESH':
+        return None
+    return obj if NailMesh.is_nail_mesh(obj.data) else None
 
 
-def geom_update_timer():
-    on_post_depsgraph_update.timer_ran = True
-    for obj in on_post_depsgraph_update.last_obj_list:
-        do_auto_apply(obj)
-    return None
-
+# How often geom_update_timer checks for pending objects when update_interval
+# is ~0, in which case on_post_depsgraph_update applies immediately instead.
+GEOM_UPDATE_TIMER_IDLE_INTERVAL = 1.0
 
+# Registered for as long as the depsgraph handler is enabled, and reschedules
+# itself by returning the interval. Applies the objects that were updated since
+# the last tick, if any.
+def geom_update_timer():
+    self = on_post_depsgraph_update
+    # Only skip the next depsgraph update if applying actually wrote to a mesh.
+    # E.g. in edit mode with nothing selected nothing is written, so no update
+    # is coming, and the skip would swallow the user's next real update instead.
+    if self.pending_obj_set and apply_pending_objects():
+        self.timer_ran = True
+    if self.update_interval < 0.04:
+        return GEOM_UPDATE_TIMER_IDLE_INTERVAL
+    return self.update_interval
+
+
+# Applies each object in on_post_depsgraph_update.pending_obj_set once, however
+# many updates it got since the last apply, and empties the set. Returns True if
+# any object's mesh was written to (see do_auto_apply).
+def apply_pending_objects():
+    pending_obj_set = on_post_depsgraph_update.pending_obj_set
+    last_errors = apply_pending_objects.last_errors
+    any_updated = False
+    for obj in pending_obj_set:
+        # An exception would unregister the timer for good, so catch everything
+        try:
+            if do_auto_apply(obj):
+                any_updated = True
+            # Once it applies again, the same error is worth printing next time
+            last_errors.pop(obj.as_pointer(), None)
+        except ReferenceError:
+            pass # Object was deleted since it was updated
+        except Exception as e:
+            # The timer keeps retrying, so an object that can't be applied would
+            # fail again on every tick. Only print the (slow to format) traceback
+            # when the object's error changes, rather than flooding the console.
+            error = repr(e)
+            key = obj.as_pointer()
+            if last_errors.get(key) != error:
+                last_errors[key] = error
+                print("Error in Nail addon:")
+                print(traceback.format_exc())
+    pending_obj_set.clear()
+    return any_updated
+
+# The last error printed for each object (by pointer) that failed to apply
+apply_pending_objects.last_errors = {}
+
+
+# Returns True if the object's mesh was written to, i.e. there's a depsgraph
+# update on its way because of it.
 def do_auto_apply(obj):
+    # In Object Mode, a mesh without any enabled NailFaces (e.g. after Clear
+    # NailFace on everything) has nothing to apply; don't bother building a BMesh.
+    # Only checked for evaluated objects, which go through the BMesh path.
+    # Otherwise apply_texture works on the Mesh attributes in bulk, reading the
+    # flags with foreach_get itself and returning as soon as it finds no enabled
+    # faces, so checking here would only read them twice.
+    if not obj.data.is_editmode and obj.is_evaluated and not mesh_has_any_nail_faces(obj.data):
+        return False
     with NailMesh(obj) as nm:
         nm.apply_texture(auto_apply=True)
+    return nm.mesh_updated
+
+
+# Scratch arrays for apply_texture_bulk, keyed by name. Auto-apply runs it over
+# and over on the same meshes, so the large per-vertex and per-loop arrays it
+# reads the Mesh data into are reused across calls instead of being allocated
+# each time. They only grow, and are freed when Nail goes to sleep.
+scratch_buffers = {}
+
+# Returns an uninitialized (n,) array, or (n,width) array, backed by the named
+# scratch buffer. Only valid until the next call with the same name.
+def get_scratch_buffer(name, dtype, n, width=1):
+    size = n * width
+    buf = scratch_buffers.get(name)
+    if buf is None or buf.dtype != dtype or buf.size < size:
+        # Leave some room to grow, e.g. while the user is adding geometry
+        buf = numpy.empty(size + size // 2, dtype)
+        scratch_buffers[name] = buf
+    return buf[:size] if width == 1 else buf[:size].reshape(n, width)
 
 
 ###############################################################################
@@ -1162,11 +1300,13 @@ class AURYCAT_OT_nail_modal_locked_scale(Operator):
 def keybind_poll(context):
     if not shared_poll(None, context, require_face_select='only'):
         return False
-    # Check for at least one NailMesh object in edit mode
-    for obj in context.objects_in_mode:
-        if NailMesh.is_nail_object(obj):
-            return True
-    return False
+    # Check for at least one NailMesh object in edit mode. This runs on every
+    # G/R/S keypress. Usually the edit object is a NailMesh itself, which can
+    # be checked without building the list of every object in edit mode.
+    # Every object in mesh edit mode is a mesh, so only the mesh check is needed.
+    if NailMesh.is_nail_mesh(context.edit_object.data):
+        return True
+    return any(NailMesh.is_nail_mesh(obj.data) for obj in context.objects_in_mode)
 
 
 # Use this for keybinds.
@@ -1284,6 +1424,8 @@ class AURYCAT_OT_nail_internal_modal_locked_transform(Operator):
             return {'CANCELLED'}
 
         context.window_manager.modal_handler_add(self)
+        if not bpy.app.timers.is_registered(locked_transform_watchdog):
+            bpy.app.timers.register(locked_transform_watchdog, first_interval=0.5)
         return {'RUNNING_MODAL'}
 
     def modal(self, context, event):
@@ -1371,29 +1513,42 @@ class AURYCAT_OT_nail_internal_modal_locked_transform(Operator):
             args['value'] = op.properties.value.copy()
 
         saved_context = {'window': context.window, 'area': context.area, 'region': context.region}
+        # Undoing the transform and redoing it through finalize_op may look
+        # wasteful, since the mesh has already been moved by the time we get
+        # here. But the texture-locking needs the UV axes of each face as they
+        # were *before* the transform (they depend on the old normals), and
+        # finalize_op needs to own the undo step so that the Adjust Last
+        # Operation panel can redo it with a different value. Texture-locking
+        # in place here and pushing a separate undo step would lose both.
+        #
+        # This has to run once this operator has FINISHED, since it undoes this
+        # operator's undo step along with the transform's. That's after the
+        # last modal() call, so it can't be done from there.
         def do_async():
             # This is hacky so do some sanity checks. Hopefully catches issues in the
             # case of a Blender change breaking this code.
-            if bpy.context.active_operator.bl_idname != this_class_name:
+            active_operator = bpy.context.active_operator
+            operators = bpy.context.window_manager.operators
+            if active_operator is None or active_operator.bl_idname != this_class_name:
                 async_report_error(
                     "Something went wrong finalizing this texture-locked transform operation.\n" + \
-                    f"(Unexpected active operator {bpy.context.active_operator.bl_idname}.)")
+                    f"(Unexpected active operator {active_operator and active_operator.bl_idname}.)")
                 return
-            elif len(bpy.context.window_manager.operators) < 2:
+            elif len(operators) < 2:
                 async_report_error(
                     "Something went wrong finalizing this texture-locked transform operation.\n" + \
                     "(Expected at least two operators in the operator history.)")
                 return
-            elif bpy.context.window_manager.operators[-1].bl_idname != this_class_name:
+            elif operators[-1].bl_idname != this_class_name:
                 # I think operators[-1] is always the same as the active_operator, but just being sure...
                 async_report_error(
                     "Something went wrong finalizing this texture-locked transform operation.\n" + \
-                    f"(Unexpected [-1] operator {bpy.context.window_manager.operators[-1].bl_idname}.)")
+                    f"(Unexpected [-1] operator {operators[-1].bl_idname}.)")
                 return
-            elif bpy.context.window_manager.operators[-2].bl_idname != underlying_op:
+            elif operators[-2].bl_idname != underlying_op:
                 async_report_error(
                     "Something went wrong finalizing this texture-locked transform operation.\n" + \
-                    f"(Unexpected [-2] operator {bpy.context.window_manager.operators[-2].bl_idname} - expected {underlying_op}.)")
+                    f"(Unexpected [-2] operator {operators[-2].bl_idname} - expected {underlying_op}.)")
                 return
             with bpy.context.temp_override(**saved_context):
                 # Undo this operator
@@ -1407,6 +1562,58 @@ class AURYCAT_OT_nail_internal_modal_locked_transform(Operator):
         bpy.app.timers.register(do_async, first_interval=0)
 
 
+# As a saftey check to make sure the hacky modal operator above can't get too
+# off the rails! Runs every half second while the operator is active. (This used
+# to be done when drawing the Nail menu, but drawing shouldn't have side effects.)
+# Note that it only cancels the operator once Blender leaves mesh edit mode.
+# Opening the Nail menu no longer cancels it by itself; instead the menu then
+# shows AURYCAT_OT_nail_cancel_locked_transform, to cancel it by hand.
+def locked_transform_watchdog():
+    cls = AURYCAT_OT_nail_internal_modal_locked_transform
+    if cls.active is None:
+        return None
+    # Check for ReferenceError because 'active' may be non-None but an invalid/destroyed bpy_struct
+    try:
+        # The operator's modal() finishes up on the next event it gets after
+        # this, which may be a while. Don't leave it marked active until then.
+        if cls.active.cancelled:
+            cls.active = None
+            return None
+        # The underlying transform operator can only be running in edit mode.
+        # If somehow not in edit mode anymore, surely the operator should be cancelled.
+        if bpy.context.mode != 'EDIT_MESH':
+            cls.active.cancelled = True
+            cls.active = None
+            return None
+    except ReferenceError:
+        cls.active = None
+        return None
+    return 0.5
+
+
+# Manual escape hatch for when the interactive texture-locked transform operator
+# is still marked active but isn't actually running anymore (which would make
+# the next texture-locked transform cancel itself). See locked_transform_watchdog.
+class AURYCAT_OT_nail_cancel_locked_transform(Operator):
+    bl_idname = "aurycat.nail_cancel_locked_transform"
+    bl_label = "Cancel Stuck Texture-Locked Transform"
+    bl_description = "Cancel an interactive texture-locked transform that appears to still be running. Only needed if something went wrong and texture-locked transforms don't work anymore"
+    bl_options = {"REGISTER"}
+
+    @classmethod
+    def poll(cls, context):
+        return AURYCAT_OT_nail_internal_modal_locked_transform.active is not None
+
+    def execute(self, context):
+        # Check for ReferenceError because 'active' may be non-None but an invalid/destroyed bpy_struct
+        try:
+            AURYCAT_OT_nail_internal_modal_locked_transform.active.cancelled = True
+        except ReferenceError:
+            pass
+        AURYCAT_OT_nail_internal_modal_locked_transform.active = None
+        return {'FINISHED'}
+
+
 # Operator logic shared across the transform, rotate, and scale finializing operators
 class SharedFinalizeInteractiveTexLockedTransform:
     bl_options = {"REGISTER", "UNDO"}
@@ -1445,8 +1652,37 @@ class SharedFinalizeInteractiveTexLockedTransform:
         # Get the local transform of the op
         op_transform = self.get_op_transform_matrix()
 
-        # And get the active pivot point, based on the current selection and pivot mode
-        world_pivot_point = compute_pivot_point()
+        # E.g. when redone with a zero value from the Adjust Last Operation
+        # panel, nothing moves, so there's nothing to transform.
+        if not op_transform.is_identity:
+            self.locked_transform_objects(context, op_transform)
+
+        # Otherwise the old vectors will get shown in the same frame
+        reset_debug_vectors()
+
+        # This action may result in NailMeshes being created; may need wakeup
+        nail_wake_if_needed()
+
+        if self.modal_hack:
+            self.modal_hack = False
+            context.window_manager.modal_handler_add(self)
+            return {'RUNNING_MODAL'}
+        else:
+            return {'FINISHED'}
+
+    # Applies op_transform (in the operator's orientation, around the pivot
+    # point) as a texture-locked transform to the selected faces of every mesh
+    # in edit mode.
+    def locked_transform_objects(self, context, op_transform):
+        # And get the active pivot point, based on the current selection and pivot mode.
+        # A translation comes out the same whatever the pivot point is, so the
+        # pivot (which looks at every selected vertex) is only computed if needed.
+        world_pivot_point = compute_pivot_point() if self.uses_pivot_point else Vector()
+
+        # The orient matrix is just rotation, and it's always in world-space.
+        # E.g. GLOBAL orientation is always identity, LOCAL is the matrix_world
+        # of the object
+        world_orient = self.orient_matrix.to_4x4()
 
         # I think ideally this would only apply to existing NailMeshes, but
         # the operator still needs to actually move the faces even if they're
@@ -1458,45 +1694,28 @@ class SharedFinalizeInteractiveTexLockedTransform:
         # a NailMesh. Otherwise they use standard Blender transform operators.
         for obj in context.objects_in_mode:
             if obj.type == 'MESH':
-                # The orient matrix is just rotation, and it's always in world-space.
-                # E.g. GLOBAL orientation is always identity, LOCAL is the matrix_world
-                # of the object
-
                 object_to_world = obj.matrix_world
                 world_to_object = object_to_world.inverted()
 
-                world_orient = self.orient_matrix.to_4x4()
-
                 # Take the translation part out of orient, since that is handled by the pivot
                 orient = world_to_object @ world_orient
                 orient.translation.xyz = 0
 
                 pivot_point = world_to_object @ world_pivot_point
-                plus_pivot = Matrix.Translation(pivot_point)
-                minus_pivot = Matrix.Translation(-pivot_point)
 
                 # Compute the final object-space transform matrix for this transform.
                 # Applying this matrix to all the selected vertices of the mesh will
                 # (hopefully!) perform the exact same transformation that the underlying
                 # Blender op did during the modal part of AURYCAT_OT_nail_internal_modal_locked_transform
-                obj_mat = plus_pivot @ orient @ op_transform @ orient.inverted() @ minus_pivot
+                # That's T(pivot) @ orient @ op_transform @ orient^-1 @ T(-pivot). Moving
+                # the pivot only changes the translation part, by pivot - M @ pivot,
+                # so that's added in directly instead of multiplying by two more matrices.
+                obj_mat = orient @ op_transform @ orient.inverted()
+                obj_mat.translation += pivot_point - obj_mat.to_3x3() @ pivot_point
 
                 with NailMesh(obj) as nm: # (Turns mesh into NailMesh if not already)
                     nm.locked_transform(obj_mat)
 
-        # Otherwise the old vectors will get shown in the same frame
-        reset_debug_vectors()
-
-        # This action may result in NailMeshes being created; may need wakeup
-        nail_wake_if_needed()
-
-        if self.modal_hack:
-            self.modal_hack = False
-            context.window_manager.modal_handler_add(self)
-            return {'RUNNING_MODAL'}
-        else:
-            return {'FINISHED'}
-
     # Somehow the (very hacky) AURYCAT_OT_nail_internal_modal_locked_transform operator that
     # runs right before this one causes Blender to not show the operator HUD/property popup
     # of this operator. Showing this operator as modal for one frame fixes it.
@@ -1573,6 +1792,10 @@ class AURYCAT_OT_nail_internal_end_locked_scale(SharedFinalizeInteractiveTexLock
 # intermediate representation between NailMesh and the operators to make
 # coding the operators simpler
 class TextureConfig:
+    # Many of these may be created, e.g. when collecting the configs of selected faces
+    __slots__ = ('shift', 'scale', 'rotation', 'flags', 'flags_set', 'uaxis', 'vaxis',
+                 'plane_world_normal', 'plane_world_point', 'multiple_faces')
+
     def __init__(tc):
         # The default None value means that the value is "unset", which is important
         # when taking input values from a user. Unset values are left unchanged on the
@@ -1611,12 +1834,24 @@ class TextureConfig:
         tc.rotation = 0
         return tc
 
+    # True when this represents the common values of multiple faces (see
+    # multiple_faces) and all of the values already differ between them. Looking
+    # at more faces can't change anything then. (TCFLAG_ENABLED is always the
+    # same, since only enabled faces are looked at.)
+    def all_values_differ(tc):
+        return (tc.multiple_faces and (tc.flags_set & ~TCFLAG_ENABLED) == 0 and
+                tc.shift is None and tc.scale is None and tc.rotation is None and
+                tc.uaxis is None and tc.vaxis is None)
+
     # None/unset values in the result means different faces had different values
     # Also this function has a side gig of checking if any faces are selected at all
     @classmethod
     def from_selected_faces(cls, out_any_selected=[False]):
         tc = TextureConfig.new_unset()
         for obj in bpy.context.objects_in_mode:
+            if tc.all_values_differ():
+                # Also implies a selected face was found
+                break
             if NailMesh.is_nail_object(obj):
                 with NailMesh(obj, readonly=True) as nm:
                     nm.get_texture_config(tc, out_any_selected=out_any_selected)
@@ -1646,6 +1881,14 @@ class TextureConfig:
         return f"<TextureConfig, f:{f}, fs:{fs}, sh:{self.shift}, sc:{self.scale}, ro:{self.rotation}, mf:{self.multiple_faces}>"
 
 
+# A face's unpacked Nail data, as returned by NailMesh.unpack_face_data.
+# One of these is created for every face processed, so it uses slots.
+class NailFace:
+    __slots__ = ('shift_flags_attr', 'scale_rot_attr', 'lock_uaxis_attr', 'lock_vaxis_attr',
+                 'shift', 'scale', 'rotation', 'flags', 'world_space', 'align_face',
+                 'align_locked', 'normal')
+
+
 # Effectively a wrapper around BMesh which performs Nail's UV-updating
 # operations. Instances of NailMesh are not meant to be kept around across
 # multiple operator invocations. Except for class methods, NailMesh should
@@ -1665,54 +1908,102 @@ class NailMesh:
     def __enter__(self):
         self.matrix_world = self.obj.matrix_world
         self.rot_world = self.matrix_world.to_quaternion()
-        self.wrap_uvs = NailPreferences.get('wrap_uvs')
+        self.matrix_world_3x3 = self.matrix_world.to_3x3()
+        # Matrix.translation makes a new Vector on every access
+        self.matrix_world_translation = self.matrix_world.translation
+        self._matrix_world_inverted = None
+        self.wrap_uvs = NailPreferences.get_cached('wrap_uvs')
         self.me = self.obj.data
-        if self.me.is_editmode:
-            self.bm = bmesh.from_edit_mesh(self.me)
-        else:
-            self.bm = bmesh.new()
-            self.bm.from_mesh(self.me)
-        if not self.readonly:
-            self.init_attrs()
-        self.uv_layer = self.bm.loops.layers.uv.active
-        for attr_name, attr_info in ATTRS.items():
-            layer = attr_info[2](self.bm)
-            setattr(self, attr_info[3], layer[attr_name])
+        self._bm = None
+        # Set by everything that writes to the BMesh. If nothing did, there's
+        # nothing to save back to the Mesh in __exit__.
+        self.modified = False
+        # Set once the Mesh itself has been written (BMesh saved to it, or UVs
+        # applied to it directly), which causes a depsgraph update. Stays False
+        # if there was nothing to apply. Still readable after exiting the 'with'.
+        self.mesh_updated = False
+        # In Object Mode, the BMesh of an existing NailMesh is only created once
+        # something actually uses it (see the bm property). That lets e.g.
+        # apply_texture work on the Mesh data directly with numpy, without
+        # converting the whole mesh to a BMesh and back.
+        if self.me.is_editmode or not NailMesh.is_nail_mesh(self.me):
+            self.init_bmesh()
         # Cache these for use in apply_texture_one_face which may be called
         # many times while the NailMesh is in use.
-        self.snap_to_pixels = NailPreferences.get('snap_to_pixels')
+        self.snap_to_pixels = NailPreferences.get_cached('snap_to_pixels')
         if self.snap_to_pixels:
-            self.snap_step = Vector(NailPreferences.get('snap_step'))
+            self.snap_step = Vector(NailPreferences.get_cached('snap_step'))
             self.snap_xy_per_material_cache = {}
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        if not self.readonly  and  exc_type is None  and  self.bm is not None  and  self.me is not None:
+        if not self.readonly  and  exc_type is None  and  self.modified  and  self._bm is not None  and  self.me is not None:
             if self.me.is_editmode:
                 bmesh.update_edit_mesh(self.me, loop_triangles=False, destructive=False)
             else:
-                self.bm.to_mesh(self.me)
-        if self.bm is not None:
-            self.bm.free()
-        self.bm = None
+                self._bm.to_mesh(self.me)
+            self.mesh_updated = True
+        if self._bm is not None:
+            # In edit mode, free() only invalidates the Python wrapper; the BMesh
+            # itself belongs to Blender and isn't rebuilt. Keeping the wrapper
+            # alive for the next from_edit_mesh was measured to make walking the
+            # faces slower, so it's freed too.
+            self._bm.free()
+        self._bm = None
         self.me = None
 
+    @property
+    def bm(self):
+        if self._bm is None:
+            self.init_bmesh()
+        return self._bm
+
+    # World-to-object matrix. Inverted on first use and then shared by every
+    # face, instead of being inverted again for each face that needs it.
+    @property
+    def matrix_world_inverted(self):
+        if self._matrix_world_inverted is None:
+            self._matrix_world_inverted = self.matrix_world.inverted()
+        return self._matrix_world_inverted
+
+    def init_bmesh(self):
+        if self.me.is_editmode:
+            self._bm = bmesh.from_edit_mesh(self.me)
+        else:
+            self._bm = bmesh.new()
+            self._bm.from_mesh(self.me)
+        if not self.readonly:
+            self.init_attrs()
+        self.uv_layer = self._bm.loops.layers.uv.active
+        # Look up each layer collection (e.g. bm.faces.layers.float_vector) only
+        # once, rather than once per attribute
+        face_layers = self._bm.faces.layers
+        layer_collections = {}
+        for attr_name, attr_info in ATTRS.items():
+            layers = layer_collections.get(attr_info[2])
+            if layers is None:
+                layers = layer_collections[attr_info[2]] = getattr(face_layers, attr_info[2])
+            setattr(self, attr_info[3], layers[attr_name])
+
     def init_attrs(self):
         if len(self.bm.loops.layers.uv) == 0:
             self.bm.loops.layers.uv.new("UVMap")
+            self.modified = True
         elif self.bm.loops.layers.uv.active is None:
             # Not sure if this is possible, but just to be safe
             raise RuntimeError(f"Mesh '{self.me.name}' has at least one UV Map, but none are marked 'active'. Please make sure a UVMap is selected on this mesh.")
 
+        face_layers = self.bm.faces.layers
         for attr_name, attr_info in ATTRS.items():
-            layer = attr_info[2](self.bm)
+            layer = getattr(face_layers, attr_info[2])
             if attr_name not in layer:
                 if attr_name in self.me.attributes:
                     # Not in faces.layers.float_vector, but it is in me.attributes, which
                     # implies the attribute already exists with some other domain/type
-                    a = self.me.attributes[attr]
+                    a = self.me.attributes[attr_name]
                     raise RuntimeError(f"Mesh '{self.me.name}' has an existing '{attr_name}' attribute that is the wrong domain or type. Expected {attr_info[0]}/{attr_info[1]}, got {a.domain}/{a.data_type}. Please remove or rename the existing attribute.")
                 layer.new(attr_name)
+                self.modified = True
 
     @classmethod
     def is_nail_object(cls, obj):
@@ -1724,29 +2015,60 @@ class NailMesh:
     def is_nail_mesh(cls, me):
         if len(me.uv_layers) == 0:
             return False
+        attributes = me.attributes
         for attr_name, attr_info in ATTRS.items():
-            if ( attr_name not in me.attributes or
-                 me.attributes[attr_name].domain != attr_info[0] or
-                 me.attributes[attr_name].data_type != attr_info[1] ):
+            # Each lookup by name goes through RNA, so only look it up once
+            attr = attributes.get(attr_name)
+            if ( attr is None or
+                 attr.domain != attr_info[0] or
+                 attr.data_type != attr_info[1] ):
                 return False
         return True
 
-    def set_texture_config(self, tc, only_selected=True):
-        only_selected = self.me.is_editmode and only_selected
-        for face in self.bm.faces:
-            if only_selected and not face.select:
-                continue
-            self.set_texture_config_one_face(tc, face)
-
-    def set_texture_config_one_face(self, tc, face):
+    # If 'faces' is given, it's used instead of finding the (selected) faces
+    def set_texture_config(self, tc, only_selected=True, faces=None):
+        if faces is None:
+            faces = self.get_faces(only_selected)
+        # The same UV axes are set on every face, so only validate them once
+        uv_axes = None
+        if tc.uaxis is not None and tc.vaxis is not None:
+            uv_axes = validate_uv_axes(tc.uaxis, tc.vaxis)
+        for face in faces:
+            self.set_texture_config_one_face(tc, face, uv_axes)
+
+    # Same as set_texture_config followed by apply_texture, but going through the
+    # faces once, setting and then applying each face in turn.
+    def set_and_apply_texture_config(self, tc, only_selected=True, faces=None):
+        if self.can_apply_texture_bulk():
+            # Applying all faces at once is still faster
+            self.set_texture_config(tc, only_selected, faces)
+            self.apply_texture()
+            return
+        if faces is None:
+            faces = self.get_faces(only_selected)
+        uv_axes = None
+        if tc.uaxis is not None and tc.vaxis is not None:
+            uv_axes = validate_uv_axes(tc.uaxis, tc.vaxis)
+        for face in faces:
+            self.set_texture_config_one_face(tc, face, uv_axes)
+            if len(face.loops) != 0:
+                self.apply_texture_one_face(face)
+
+    # uv_axes is tc's UV axes already passed through validate_uv_axes, if given
+    def set_texture_config_one_face(self, tc, face, uv_axes=None):
+        self.modified = True
         shift_flags_attr = face[self.shift_flags_layer]
         scale_rot_attr = face[self.scale_rot_layer]
 
         # Any set flags from tc will overwrite existing flags
         # Any others will remain unchanged
-        flags = int(shift_flags_attr.z)
-        new_flags = (flags & ~tc.flags_set) | (tc.flags & tc.flags_set)
-        shift_flags_attr.z = float(new_flags)
+        # (The flags are stored as a float, so skip converting them back and
+        # forth when there's nothing to change.)
+        if tc.flags_set != 0:
+            flags = int(shift_flags_attr.z)
+            new_flags = (flags & ~tc.flags_set) | (tc.flags & tc.flags_set)
+            if new_flags != flags:
+                shift_flags_attr.z = float(new_flags)
 
         if tc.shift is not None:
             shift_flags_attr.xy = tc.shift
@@ -1759,22 +2081,40 @@ class NailMesh:
         if tc.uaxis is not None and tc.vaxis is not None:
             f = self.unpack_face_data(face, calc_normal=True)
             if f is not None:
-                self.set_face_uv_axes(f, tc.uaxis, tc.vaxis)
-
-    def edge_align(self, tc, only_selected=True):
-        only_selected = self.me.is_editmode and only_selected
-        for face in self.bm.faces:
-            if only_selected and not face.select:
-                continue
-            self.edge_align_one_face(tc, face)
+                if uv_axes is None:
+                    uv_axes = validate_uv_axes(tc.uaxis, tc.vaxis)
+                self.set_face_validated_uv_axes(f, *uv_axes)
+
+    def edge_align(self, tc, only_selected=True, faces=None):
+        if faces is None:
+            faces = self.get_faces(only_selected)
+        # See edge_align_one_face
+        edge_rotations = {}
+        for face in faces:
+            self.edge_align_one_face(tc, face, edge_rotations)
+
+    # All faces of the BMesh, or in edit mode with only_selected, just the
+    # selected ones. Mesh.total_face_sel is kept up to date by edit mode, so if
+    # nothing is selected the faces don't need to be looked at at all.
+    def get_faces(self, only_selected=True):
+        if self.me.is_editmode and only_selected:
+            if self.me.total_face_sel == 0:
+                return []
+            return [face for face in self.bm.faces if face.select]
+        return self.bm.faces
 
     # Ported from the function CopyTCoordSystem from Hammer (please don't sue me)
     # Implements the 'Alt + Rightclick' functionality of Hammer
     # The source/active face info is in 'tc', the destination face is 'face'
-    def edge_align_one_face(self, tc, face):
+    # The rotation around the edge only depends on the source plane and the
+    # destination face's normal. If given, 'edge_rotations' caches it by normal
+    # for the faces aligned with the same tc, since the selected faces of flat
+    # level geometry often share a few normals.
+    def edge_align_one_face(self, tc, face, edge_rotations=None):
         f = self.unpack_face_data(face, calc_normal=True)
         if f is None:
             return
+        self.modified = True
 
         face_world_normal = f.normal if f.world_space else self.rot_world @ face.normal
 
@@ -1789,27 +2129,33 @@ class NailMesh:
         if edge_point is not None:
             # The source and the destination faces are not parallel,
             # so wrap the texture around the intersection edge
-            edge = tc.plane_world_normal.cross(face_world_normal)
-            src_normal = uaxis.cross(vaxis)
-            src_normal.normalize()
-
-            proj_src_normal = src_normal - edge * edge.dot(src_normal)
-            proj_src_normal.normalize()
-            proj_dst_normal = face_world_normal - edge * edge.dot(face_world_normal)
-            proj_dst_normal.normalize()
+            key = face_world_normal.to_tuple()
+            edge_rotation = edge_rotations.get(key) if edge_rotations is not None else None
+            if edge_rotation is None:
+                edge = tc.plane_world_normal.cross(face_world_normal)
+                src_normal = uaxis.cross(vaxis)
+                src_normal.normalize()
+
+                proj_src_normal = src_normal - edge * edge.dot(src_normal)
+                proj_src_normal.normalize()
+                proj_dst_normal = face_world_normal - edge * edge.dot(face_world_normal)
+                proj_dst_normal.normalize()
+
+                dot = proj_src_normal.dot(proj_dst_normal)
+                angle = math.acos(dot)
+                if dot < 0.0:
+                    angle = math.pi - angle
+
+                edge_rotation = Matrix.Rotation(angle, 3, edge)
+                if edge_rotations is not None:
+                    edge_rotations[key] = edge_rotation
 
-            dot = proj_src_normal.dot(proj_dst_normal)
-            angle = math.acos(dot)
-            if dot < 0.0:
-                angle = math.pi - angle
-
-            edge_rotation = Matrix.Rotation(angle, 4, edge)
             uaxis = edge_rotation @ uaxis
             vaxis = edge_rotation @ vaxis
 
-            translation = Matrix.Translation(edge_point)
-            origin_rotation = translation.inverted() @ edge_rotation @ translation
-            origin = origin_rotation @ origin
+            # Same as applying Translation(-edge_point) @ edge_rotation @ Translation(edge_point),
+            # without building and inverting 4x4 matrices.
+            origin = edge_rotation @ (origin + edge_point) - edge_point
 
         # Get the new shift, scale, and rotation for the dst face
         scale = tc.scale.xy
@@ -1820,7 +2166,7 @@ class NailMesh:
         # Set dst face to the space alignment of the src face
         f.shift_flags_attr.z = float(copy_flag(f.shift_flags_attr.z, tc.flags, TCFLAG_OBJECT_SPACE))
         if flag_is_set(tc.flags, TCFLAG_OBJECT_SPACE):
-            w2o = self.matrix_world.inverted()
+            w2o = self.matrix_world_inverted
             # Convert to object space (modifies shift and scale arguments)
             uaxis, vaxis = transform_uvaxis_shift_scale_by_matrix( \
                 uaxis, vaxis, shift, scale, w2o.to_3x3(), w2o.translation)
@@ -1833,19 +2179,24 @@ class NailMesh:
 
     def convert_coordinate_space(self, to_world, only_selected=True):
         only_selected = self.me.is_editmode and only_selected
+        # Every face is converted by the same matrix, so separate out its
+        # translation (as required by locked_transform_one_face) just once
+        rs_mat = (self.matrix_world if to_world else self.matrix_world_inverted).copy()
+        translation = rs_mat.translation.xyz
+        rs_mat.translation.xyz = 0
         for face in self.bm.faces:
             if only_selected and not face.select:
                 continue
-            self.convert_coordinate_space_one_face(face, to_world)
+            self.convert_coordinate_space_one_face(face, to_world, rs_mat, translation)
 
-    def convert_coordinate_space_one_face(self, face, to_world):
+    def convert_coordinate_space_one_face(self, face, to_world, rs_mat, translation):
         f = self.unpack_face_data(face, calc_normal=False)
         if f is None:
             return
         if f.world_space == to_world:
             return
+        self.modified = True
 
-        rs_mat = self.matrix_world.copy()
         if to_world:
             f.flags = clear_flag(f.shift_flags_attr.z, TCFLAG_OBJECT_SPACE)
             f.world_space = True
@@ -1855,16 +2206,11 @@ class NailMesh:
             f.flags = set_flag(f.shift_flags_attr.z, TCFLAG_OBJECT_SPACE)
             f.world_space = False
             f.normal = face.normal
-            rs_mat.invert()
             saved_normal = self.rot_world @ face.normal
 
         # Write back modified flags
         f.shift_flags_attr.z = float(f.flags)
 
-        # Separate out translation as required by locked_transform_one_face
-        translation = rs_mat.translation.xyz
-        rs_mat.translation.xyz = 0
-
         self.locked_transform_one_face(f, translation, rs_mat, saved_normal)
 
     # tc is an in-out parameter
@@ -1872,12 +2218,80 @@ class NailMesh:
     # be collected together by passing the same tc back in each time
     def get_texture_config(self, tc, only_selected=True, out_any_selected=[False]):
         only_selected = self.me.is_editmode and only_selected
-        for face in self.bm.faces:
-            if only_selected and not face.select:
-                continue
-            out_any_selected[0] = True
-            if self.get_texture_config_one_face(face, tc):
-                tc.multiple_faces = True
+
+        # Rather than unpacking and comparing the faces one by one (see
+        # get_texture_config_one_face), read the values of all the faces into
+        # arrays and compare them all at once.
+        if self._bm is None:
+            # Object Mode, and nothing has needed the BMesh yet. All faces are
+            # used, so read the Mesh attributes directly instead of creating it.
+            if len(self.me.polygons) == 0:
+                return
+            shift_flags = get_face_vec3_array(self.me, "Nail_ShiftFlags")
+        else:
+            # In edit mode (or once a BMesh exists with possibly unsaved
+            # changes) the Mesh data may be stale, so read from the BMesh.
+            faces = self.bm.faces
+            if only_selected:
+                faces = [face for face in faces if face.select]
+            if len(faces) == 0:
+                return
+            shift_flags = get_bmesh_face_vec3_array(faces, self.shift_flags_layer)
+        out_any_selected[0] = True
+
+        flags = shift_flags[:,2].astype(numpy.uint8)
+        enabled = (flags & TCFLAG_ENABLED) != 0
+        if not enabled.any():
+            return
+        shift_flags = shift_flags[enabled]
+        flags = flags[enabled]
+        if self._bm is None:
+            scale_rot = get_face_vec3_array(self.me, "Nail_ScaleRot")[enabled]
+            lock_uaxis = get_face_vec3_array(self.me, "Nail_LockUAxis")[enabled]
+            lock_vaxis = get_face_vec3_array(self.me, "Nail_LockVAxis")[enabled]
+        else:
+            # Only the enabled faces need their other attributes read
+            faces = [face for face, e in zip(faces, enabled) if e]
+            scale_rot = get_bmesh_face_vec3_array(faces, self.scale_rot_layer)
+            lock_uaxis = get_bmesh_face_vec3_array(faces, self.lock_uaxis_layer)
+            lock_vaxis = get_bmesh_face_vec3_array(faces, self.lock_vaxis_layer)
+
+        # Same fixups of default/invalid values as unpack_face_data
+        lock_uaxis[(lock_uaxis == 0).all(axis=1)] = RIGHT_VECTORS[0]
+        lock_vaxis[(lock_vaxis == 0).all(axis=1)] = UP_VECTORS[0]
+        scales = scale_rot[:,:2]
+        scales[numpy.abs(scales) <= 1e-5] = 1
+
+        if not tc.multiple_faces:
+            # The first face sets the initial values
+            tc.flags = int(flags[0])
+            tc.flags_set = TCFLAG_ALL
+            tc.shift = Vector(shift_flags[0,:2])
+            tc.scale = Vector(scales[0])
+            tc.rotation = float(scale_rot[0,2])
+            tc.uaxis = Vector(lock_uaxis[0])
+            tc.vaxis = Vector(lock_vaxis[0])
+            tc.multiple_faces = True
+
+        # Find all the bits that are different between tc.flags and any face's flags
+        flag_diff = int(numpy.bitwise_or.reduce(flags ^ numpy.uint8(tc.flags)))
+        # and mark them unset
+        tc.flags &= ~flag_diff
+        tc.flags_set &= ~flag_diff
+
+        # Unset any values which differ between tc and any face
+        def differ(values, tc_value):
+            return (values != numpy.array(tc_value, numpy.float32)).any()
+        if tc.shift is not None and differ(shift_flags[:,:2], tc.shift):
+            tc.shift = None
+        if tc.scale is not None and differ(scales, tc.scale):
+            tc.scale = None
+        if tc.rotation is not None and differ(scale_rot[:,2], tc.rotation):
+            tc.rotation = None
+        if tc.uaxis is not None and differ(lock_uaxis, tc.uaxis):
+            tc.uaxis = None
+        if tc.vaxis is not None and differ(lock_vaxis, tc.vaxis):
+            tc.vaxis = None
 
     # tc is an in-out parameter
     # Returns True if the face has Nail enabled, False otherwise (tc not modified)
@@ -1935,7 +2349,8 @@ class NailMesh:
 
     # Applies the existing saved shift/scale/rotation uv axis configurations
     # of selected faces. See apply_texture_one_face for more detail.
-    def apply_texture(self, auto_apply=False, editmode_only_selected=True):
+    # If 'faces' is given (e.g. from get_faces), only those faces are applied
+    def apply_texture(self, auto_apply=False, editmode_only_selected=True, faces=None):
 
         # Don't live update selected faces while doing a locked transform
         auto_apply_during_texture_locked_transform = \
@@ -1951,7 +2366,35 @@ class NailMesh:
                 # Only selected faces
                 apply_mode = 2
 
-        for face in self.bm.faces:
+        # In Object Mode, apply straight on the Mesh data instead, all faces at
+        # once. If a BMesh was already created (e.g. to set texture configs just
+        # before), it's flushed to the Mesh first.
+        if self.can_apply_texture_bulk():
+            self.flush_bmesh()
+            self.apply_texture_bulk(skip_selected=auto_apply_during_texture_locked_transform)
+            return
+
+        if faces is not None:
+            for face in faces:
+                if len(face.loops) != 0:
+                    self.apply_texture_one_face(face)
+            return
+
+        faces = self.bm.faces
+        if apply_mode == 1:
+            num_selected_verts = self.me.total_vert_sel
+            if num_selected_verts == 0:
+                return
+            if num_selected_verts < len(self.bm.verts) // 4:
+                # With only a few vertices selected, rather than checking every
+                # vertex of every face for a selected one, go from the selected
+                # vertices to their faces. (That includes the selected faces,
+                # whose vertices are all selected.) For large selections,
+                # building the set costs more than it saves.
+                faces = {face for v in self.bm.verts if v.select for face in v.link_faces}
+                apply_mode = 0
+
+        for face in faces:
             if len(face.loops) == 0: # Not sure if this is possible, but safety check anyway
                 continue
 
@@ -1973,6 +2416,203 @@ class NailMesh:
 
             self.apply_texture_one_face(face)
 
+    # Returns the (snap_x, snap_y) number of UV snapping steps per UV unit for
+    # faces with the given material index, or 0 for no snapping on that axis.
+    def get_snap_xy(self, material_index):
+        if material_index in self.snap_xy_per_material_cache:
+            return self.snap_xy_per_material_cache[material_index]
+        # Lookup face's material and find the snap_x, snap_y values.
+        # Will be the same per material_index value, so cache it.
+        # Some quick profiling shows caching helps a little on large meshes.
+        snap_x, snap_y = 0, 0
+        try:
+            slot = self.obj.material_slots[material_index]
+            if slot.material and slot.material.use_nodes:
+                tex_node = next((n for n in slot.material.node_tree.nodes if n.type == 'TEX_IMAGE' and n.image), None)
+                if tex_node:
+                    img_width, img_height = tex_node.image.size[0], tex_node.image.size[1]
+                    if self.snap_step.x >= 1:
+                        snap_x = img_width / self.snap_step.x
+                    if self.snap_step.y >= 1:
+                        snap_y = img_height / self.snap_step.y
+                    self.snap_xy_per_material_cache[material_index] = (snap_x, snap_y)
+        except Exception:
+            pass
+        return (snap_x, snap_y)
+
+    # The features apply_texture_bulk doesn't handle (yet) fall back to the BMesh
+    # path. Evaluated objects (from the immediate auto-apply path) also use the
+    # BMesh path; their mesh is a temporary copy that may share its data arrays
+    # with the original mesh, which foreach_set would write straight through.
+    def can_apply_texture_bulk(self):
+        return not (self.me.is_editmode or self.obj.is_evaluated or \
+                    self.me.uv_layers.active is None)
+
+    # In Object Mode, saves the BMesh (if one was created) to the Mesh and frees
+    # it, so that the Mesh data is up to date and can be worked on directly. The
+    # bm property creates a new BMesh again if it's used afterwards.
+    def flush_bmesh(self):
+        if self._bm is None or self.me.is_editmode:
+            return
+        if not self.readonly and self.modified:
+            self._bm.to_mesh(self.me)
+            self.modified = False
+            self.mesh_updated = True
+        self._bm.free()
+        self._bm = None
+
+    # Same as calling apply_texture_one_face on every face, but done for all faces
+    # at once with numpy, reading and writing the Mesh data directly via
+    # foreach_get/foreach_set. Only for Object Mode, without a BMesh (see bm).
+    def apply_texture_bulk(self, skip_selected=False):
+        me = self.me
+        num_faces = len(me.polygons)
+        if num_faces == 0:
+            return
+
+        shift_flags = get_face_vec3_array(me, "Nail_ShiftFlags")
+        flags = shift_flags[:,2].astype(numpy.uint8)
+        enabled = (flags & TCFLAG_ENABLED) != 0
+        if skip_selected:
+            select = numpy.empty(num_faces, bool)
+            me.polygons.foreach_get("select", select)
+            enabled &= ~select
+        if not enabled.any():
+            return
+
+        scale_rot = get_face_vec3_array(me, "Nail_ScaleRot")
+        lock_uaxis = get_face_vec3_array(me, "Nail_LockUAxis")
+        lock_vaxis = get_face_vec3_array(me, "Nail_LockVAxis")
+
+        # Same fixups of default/invalid values as unpack_face_data, which
+        # are saved back to the mesh as well.
+        fix_uaxis = enabled & (lock_uaxis == 0).all(axis=1)
+        if fix_uaxis.any():
+            lock_uaxis[fix_uaxis] = RIGHT_VECTORS[0]
+            set_face_vec3_array(me, "Nail_LockUAxis", lock_uaxis)
+        fix_vaxis = enabled & (lock_vaxis == 0).all(axis=1)
+        if fix_vaxis.any():
+            lock_vaxis[fix_vaxis] = UP_VECTORS[0]
+            set_face_vec3_array(me, "Nail_LockVAxis", lock_vaxis)
+        fix_scale = enabled[:,None] & (numpy.abs(scale_rot[:,:2]) <= 1e-5)
+        if fix_scale.any():
+            scale_rot[:,:2][fix_scale] = 1
+            set_face_vec3_array(me, "Nail_ScaleRot", scale_rot)
+
+        # From here on, only the enabled faces matter
+        faces = numpy.flatnonzero(enabled)
+        flags = flags[faces]
+        world_space = (flags & TCFLAG_OBJECT_SPACE) == 0
+
+        normals = get_scratch_buffer("normals", numpy.float32, num_faces, 3)
+        me.polygon_normals.foreach_get("vector", normals.ravel())
+        normals = normals[faces].astype(numpy.float64)
+        if world_space.any():
+            rot_world = numpy.array(self.rot_world.to_matrix())
+            normals[world_space] = normals[world_space] @ rot_world.T
+
+        uaxes, vaxes = face_uv_axes_bulk(normals, flags, lock_uaxis[faces], lock_vaxis[faces])
+
+        # Fuse everything into one affine map per face, like apply_texture_one_face.
+        # affine[f] is the 2x4 matrix with rows (u_row, u_offset), (v_row, v_offset)
+        # Dividing by the scale is folded into the (n,1) cos/sin columns, which
+        # is cheaper than dividing the (n,3) rows by it afterwards
+        rotation = scale_rot[faces,2].astype(numpy.float64)
+        cos_r = numpy.cos(rotation)[:,None]
+        sin_r = numpy.sin(rotation)[:,None]
+        inv_scale = 1 / scale_rot[faces,:2].astype(numpy.float64)
+        inv_scale_u = inv_scale[:,0,None]
+        inv_scale_v = inv_scale[:,1,None]
+        affine = numpy.empty((len(faces), 2, 4))
+        u_rows = affine[:,0,:3]
+        v_rows = affine[:,1,:3]
+        offsets = affine[:,:,3]
+        u_rows[:] = uaxes * (cos_r * inv_scale_u) - vaxes * (sin_r * inv_scale_u)
+        v_rows[:] = uaxes * (sin_r * inv_scale_v) + vaxes * (cos_r * inv_scale_v)
+        offsets[:] = shift_flags[faces,:2]
+        if world_space.any():
+            translation = numpy.array(self.matrix_world_translation)
+            matrix_world_3x3 = numpy.array(self.matrix_world_3x3)
+            offsets[world_space,0] += u_rows[world_space] @ translation
+            offsets[world_space,1] += v_rows[world_space] @ translation
+            u_rows[world_space] = u_rows[world_space] @ matrix_world_3x3
+            v_rows[world_space] = v_rows[world_space] @ matrix_world_3x3
+
+        # Find the loops of the enabled faces
+        # A face's loops directly follow the previous face's, so loop_total is
+        # just the difference between consecutive loop_starts
+        loop_start = get_scratch_buffer("loop_start", numpy.int32, num_faces)
+        me.polygons.foreach_get("loop_start", loop_start)
+        loop_total = numpy.diff(loop_start, append=numpy.int32(len(me.loops)))
+        all_faces = len(faces) == num_faces
+        if not all_faces:
+            loop_start = loop_start[faces]
+            loop_total = loop_total[faces]
+        if all_faces:
+            # Every loop gets a new UV, and the faces' loops are in order
+            loops = slice(None)
+        else:
+            # Index of each loop, e.g. for loop_start [0, 7] and loop_total [3, 2],
+            # gives [0, 1, 2, 7, 8]
+            loops = numpy.arange(loop_total.sum()) + numpy.repeat(loop_start - (numpy.cumsum(loop_total) - loop_total), loop_total)
+
+        # Read through the attributes that store the loops' vertex indices and
+        # the vertex positions. foreach_get copies those arrays in one go, while
+        # me.loops/me.vertices go through every element one by one.
+        loop_vert = get_scratch_buffer("loop_vert", numpy.int32, len(me.loops))
+        me.attributes[".corner_vert"].data.foreach_get("value", loop_vert)
+        verts = get_scratch_buffer("verts", numpy.float32, len(me.vertices), 3)
+        me.attributes["position"].data.foreach_get("vector", verts.ravel())
+
+        snap = None
+        if self.snap_to_pixels:
+            material_index = numpy.empty(num_faces, numpy.int32)
+            me.polygons.foreach_get("material_index", material_index)
+            material_index = material_index[faces]
+            snap = numpy.zeros((len(faces), 2))
+            for mi in numpy.unique(material_index):
+                snap[material_index == mi] = self.get_snap_xy(int(mi))
+
+        uvs = project_uvs(verts, loop_vert[loops], loop_total, affine, snap, self.wrap_uvs)
+
+        if draw_handler is not None:
+            self.debug_draw_uv_axes_bulk(verts[loop_vert[loops]], loop_total, world_space, uaxes, vaxes)
+
+        # All the UVs are written back with a single foreach_set
+        # The float32 UVs are staged in a buffer reused across calls, since
+        # this runs for every depsgraph update while auto-apply is on.
+        uv_data = me.uv_layers.active.uv
+        all_uvs = get_scratch_buffer("uvs", numpy.float32, len(me.loops), 2)
+        if all_faces:
+            # No need to read the old UVs, they're all overwritten
+            all_uvs[:] = uvs
+        else:
+            uv_data.foreach_get("vector", all_uvs.ravel())
+            all_uvs[loops] = uvs
+        uv_data.foreach_set("vector", all_uvs.ravel())
+        me.update()
+        self.mesh_updated = True
+
+    # Debug draws the UV axes of the faces applied by apply_texture_bulk at their
+    # centers, the same as apply_texture_one_face does. co is the (L,3) vertex
+    # coordinates of the faces' loops, in order, and loop_total is the number of
+    # loops of each face.
+    def debug_draw_uv_axes_bulk(self, co, loop_total, world_space, uaxes, vaxes):
+        # Same as BMFace.calc_center_median, the mean of the face's vertices
+        centers = numpy.add.reduceat(co, numpy.cumsum(loop_total) - loop_total) / loop_total[:,None]
+        # Always draw in world space
+        object_space = ~world_space
+        if object_space.any():
+            rot_world = numpy.array(self.rot_world.to_matrix())
+            uaxes = uaxes.copy()
+            vaxes = vaxes.copy()
+            uaxes[object_space] = uaxes[object_space] @ rot_world.T
+            vaxes[object_space] = vaxes[object_space] @ rot_world.T
+        matrix_world = numpy.array(self.matrix_world)
+        centers = centers @ matrix_world[:3,:3].T + matrix_world[:3,3]
+        debug_draw_vecs_bulk(centers, uaxes, Vector((1,0,0)))
+        debug_draw_vecs_bulk(centers, vaxes, Vector((0,1,0)))
+
     # Applies a face's existing saved shift/scale/rotation/uv axis configuration
     # to the face's UVs. When auto-apply is enabled, this is called constantly,
     # for every face each time the face is modified. Also this is called when the
@@ -1981,6 +2621,7 @@ class NailMesh:
         f = self.unpack_face_data(face)
         if f is None:
             return
+        self.modified = True
 
         uaxis, vaxis = self.get_face_uv_axes(f)
 
@@ -1996,60 +2637,76 @@ class NailMesh:
             debug_draw_vec(center, debug_uaxis, Vector((1,0,0)))
             debug_draw_vec(center, debug_vaxis, Vector((0,1,0)))
 
-        rotation_mat = Matrix.Rotation(f.rotation, 2)
         uv_layer = self.uv_layer
 
         snap_x, snap_y = 0, 0
         if self.snap_to_pixels:
-            if face.material_index in self.snap_xy_per_material_cache:
-                snap_x, snap_y = self.snap_xy_per_material_cache[face.material_index]
-            else:
-                # Lookup face's material and find the snap_x, snap_y values.
-                # Will be the same per material_index value, so cache it.
-                # Some quick profiling shows caching helps a little on large meshes.
-                try:
-                    slot = self.obj.material_slots[face.material_index]
-                    if slot.material and slot.material.use_nodes:
-                        tex_node = next((n for n in slot.material.node_tree.nodes if n.type == 'TEX_IMAGE' and n.image), None)
-                        if tex_node:
-                            img_width, img_height = tex_node.image.size[0], tex_node.image.size[1]
-                            if self.snap_step.x >= 1:
-                                snap_x = img_width / self.snap_step.x
-                            if self.snap_step.y >= 1:
-                                snap_y = img_height / self.snap_step.y
-                            self.snap_xy_per_material_cache[face.material_index] = (snap_x, snap_y)
-                except Exception:
-                    pass
-
-        for loop in face.loops:
-            vert_coord = loop.vert.co
-            if f.world_space:
-                vert_coord = self.matrix_world @ vert_coord
-
-            uv_coord = Vector((vert_coord.dot(uaxis), vert_coord.dot(vaxis)))
-            uv_coord.rotate(rotation_mat)
-            uv_coord.x /= f.scale.x
-            uv_coord.y /= f.scale.y
-            uv_coord += f.shift
+            snap_x, snap_y = self.get_snap_xy(face.material_index)
+
+        # Projecting onto the UV axes, rotating, scaling, and shifting (and for
+        # world-space faces, the object's transform) are all affine, so fuse them
+        # into one affine map for the whole face. Then each loop's UV is just
+        #   uv = (u_row . co + u_offset, v_row . co + v_offset)
+        # The rotation matches Matrix.Rotation(f.rotation, 2) applied to (u, v).
+        cos_r = math.cos(f.rotation)
+        sin_r = math.sin(f.rotation)
+        u_row = (uaxis * cos_r - vaxis * sin_r) / f.scale.x
+        v_row = (uaxis * sin_r + vaxis * cos_r) / f.scale.y
+        u_offset = f.shift.x
+        v_offset = f.shift.y
+        if f.world_space:
+            # row . (M @ co + t) == (row @ M) . co + row . t
+            translation = self.matrix_world_translation
+            u_offset += u_row.dot(translation)
+            v_offset += v_row.dot(translation)
+            u_row = u_row @ self.matrix_world_3x3
+            v_row = v_row @ self.matrix_world_3x3
+
+        # This loop runs for every corner of every applied face, so it's written
+        # with plain floats; no Vector is created per loop.
+        urx, ury, urz = u_row
+        vrx, vry, vrz = v_row
+        loops = face.loops
+
+        # Wrapping shifts every UV of the face by the same whole amount, chosen
+        # so the first loop's UV ends up in [0,1), the same as project_uvs. That
+        # amount is taken from the first loop as it's computed, so every UV is
+        # still computed and written exactly once.
+        wrap_u, wrap_v = 0, 0
+        wrap = self.wrap_uvs
+        for loop in loops:
+            x, y, z = loop.vert.co
+            u = x*urx + y*ury + z*urz + u_offset
+            v = x*vrx + y*vry + z*vrz + v_offset
 
             if snap_x > 0:
-                uv_coord.x = round(uv_coord.x * snap_x) / snap_x
+                u = round(u * snap_x) / snap_x
             if snap_y > 0:
-                uv_coord.y = round(uv_coord.y * snap_y) / snap_y
+                v = round(v * snap_y) / snap_y
 
-            loop[uv_layer].uv = uv_coord
+            if wrap:
+                wrap_u = -math.floor(u)
+                wrap_v = -math.floor(v)
+                wrap = False
 
-        if self.wrap_uvs:
-            coord0 = face.loops[0][uv_layer].uv
-            wrapped_coord0 = Vector((frac(coord0.x), frac(coord0.y)))
-            diff_coord0 = wrapped_coord0 - coord0
-            for loop in face.loops:
-                loop[uv_layer].uv += diff_coord0
+            loop[uv_layer].uv = (u + wrap_u, v + wrap_v)
 
     # Transforms the mesh and updates the texture shift, scale, and UV axes of the
     # moved by the same transformation so that the UVs shift with the mesh.
     # obj_mat is the object-space transformation to apply to faces.
     def locked_transform(self, obj_mat, only_selected=True):
+        for faces, uaxes, vaxes, shifts, scales, rs_mat, translation in \
+                self.locked_transform_begin(obj_mat, only_selected):
+            # If rs_mat is not identity, a rotation and/or scale was applied,
+            # so the uvaxes and scale may have been modified.
+            uaxes, vaxes, shifts, scales = transform_uvaxes_shift_scale_by_matrix_bulk( \
+                uaxes, vaxes, shifts, scales, rs_mat, translation)
+            self.locked_transform_end(faces, uaxes, vaxes, shifts, scales, rs_mat.is_identity)
+
+    # First half of locked_transform. Transforms the mesh, and returns the data
+    # needed to transform the UV axes, shift, and scale of the moved faces, as
+    # a list of (faces, uaxes, vaxes, shifts, scales, rs_mat, translation) batches.
+    def locked_transform_begin(self, obj_mat, only_selected=True):
         all_faces = not (self.me.is_editmode and only_selected)
 
         # Should already be in face selection mode due to operator poll, this is just an assert
@@ -2057,15 +2714,49 @@ class NailMesh:
             raise RuntimeError("Mesh must be in face selection mode to use locked_transform()")
 
         # In order to calculate the UV axis transformation, need to know the
-        # normal prior to transform. But for part of the calculation we also
-        # need to know the new normal; easiest way is to save previous normals
-        # and do the mesh transform before doing UV axis transform.
-        saved_normals = [face.normal.copy() for face in self.bm.faces if (all_faces or face.select)]
+        # existing UV axes, which depend on the normal prior to transform. So
+        # unpack the faces and get their UV axes in a single pass before the
+        # mesh is transformed, rather than saving every face's normal first.
+        # They're gathered so the transform can be applied to all of them at
+        # once rather than doing a handful of mathutils operations per face.
+        # World-space and object-space faces are transformed by different
+        # matrices, so they're gathered into two separate batches.
+        batches = {True: [], False: []}
+        for face in self.bm.faces:
+            if not (all_faces or face.select):
+                continue
+            f = self.unpack_face_data(face)
+            if f is None:
+                continue
+            batches[f.world_space].append((f, face))
+
+        # Get the existing UV axes of each batch all at once, the same way as
+        # apply_texture_bulk, rather than going through get_face_uv_axes for
+        # each face. f.normal may be the face's own normal, which changes once
+        # the mesh is transformed, so this has to happen first.
+        uv_axes = {}
+        for world_space, batch in batches.items():
+            n = len(batch)
+            if n != 0:
+                uv_axes[world_space] = face_uv_axes_bulk(
+                    stack_rows((f.normal for f, _ in batch), n, 3),
+                    numpy.fromiter((f.flags for f, _ in batch), numpy.int32, n),
+                    stack_rows((f.lock_uaxis_attr for f, _ in batch), n, 3),
+                    stack_rows((f.lock_vaxis_attr for f, _ in batch), n, 3))
 
         # Apply transformation to selected faces
+        self.modified = True
         self.bm.transform(obj_mat, filter={'SELECT'})
+        # Even a move changes the normals of the unselected faces sharing
+        # vertices with the moved ones, so always update them
         self.bm.normal_update()
 
+        # For the rest of the calculation, f.normal is the new normal
+        for f, face in batches[True]:
+            f.normal = self.rot_world @ face.normal
+        for f, face in batches[False]:
+            f.normal = face.normal
+
         # Convert obj_mat to world-space. It's not just multiplying by
         # `self.obj.matrix_world``. As a simple example, take an object
         # whose X scale is 2, and so might have a matrix_world like
@@ -2089,28 +2780,71 @@ class NailMesh:
         # That converts to object space. Once in object space, apply obj_mat,
         # then finally convert back to world space. That will give us the
         # desired transformation in world space.
-        world_mat = self.obj.matrix_world @ obj_mat @ self.obj.matrix_world.inverted()
+        if obj_mat.to_3x3().is_identity:
+            # A move stays a move in world space, just by matrix_world's 3x3.
+            # Building it directly keeps the 3x3 an exact identity; the full
+            # product leaves rounding noise that would send every world-space
+            # face through the general rotate/scale path in locked_transform_end.
+            world_mat = Matrix.Translation(self.matrix_world.to_3x3() @ obj_mat.translation)
+        else:
+            world_mat = self.matrix_world @ obj_mat @ self.matrix_world_inverted
 
-        # Separate out translation as required by locked_transform_one_face
+        # Separate out translation as required by transform_uvaxes_shift_scale_by_matrix_bulk
         obj_translation = obj_mat.translation.xyz
         obj_mat.translation.xyz = 0
         world_translation = world_mat.translation.xyz
         world_mat.translation.xyz = 0
 
-        i = 0
-        for face in self.bm.faces:
-            if all_faces or face.select:
-                f = self.unpack_face_data(face)
-                if f is None:
-                    continue
-                if f.world_space:
-                    self.locked_transform_one_face(f, world_translation, world_mat, self.rot_world @ saved_normals[i])
-                else:
-                    self.locked_transform_one_face(f, obj_translation, obj_mat, saved_normals[i])
-                i += 1
+        result = []
+        for world_space, rs_mat, translation in ((True, world_mat, world_translation),
+                                                 (False, obj_mat, obj_translation)):
+            batch = batches[world_space]
+            if len(batch) == 0:
+                continue
+            n = len(batch)
+            uaxes, vaxes = uv_axes[world_space]
+            result.append(([b[0] for b in batch], uaxes, vaxes,
+                           stack_rows((b[0].shift for b in batch), n, 2),
+                           stack_rows((b[0].scale for b in batch), n, 2),
+                           rs_mat, translation))
+        return result
+
+    # Second half of locked_transform. Writes back the transformed UV axes, shift,
+    # and scale of one batch returned by locked_transform_begin.
+    def locked_transform_end(self, faces, uaxes, vaxes, shifts, scales, rs_identity):
+        self.modified = True
+        # Assigning rows of Python floats to the face attributes is several times
+        # faster than assigning numpy rows, which are converted element by element.
+        # The components are stored one by one, which is also a few times faster
+        # than the .xy/.xyz swizzle setters, which go through the sequence protocol.
+        # Only a pure translation leaves the scale and UV axes unchanged, in which
+        # case they aren't written at all.
+        if rs_identity:
+            for f, shift in zip(faces, iter_rows(shifts)):
+                attr = f.shift_flags_attr
+                attr.x, attr.y = shift
+            return
+        # Same as set_face_uv_axes for each face, with all the comparisons done
+        # at once. f.normal is the new face normal (post- object transform being applied).
+        normals = stack_rows((f.normal for f in faces), len(faces), 3)
+        uaxes, vaxes, align = uv_axes_alignment_bulk(normals, uaxes, vaxes)
+        keep_flags = ~(TCFLAG_ALIGN_LOCKED | TCFLAG_ALIGN_FACE)
+        for f, align_flags, uaxis, vaxis, shift, scale in zip(faces, align.tolist(), iter_rows(uaxes),
+                                                              iter_rows(vaxes), iter_rows(shifts), iter_rows(scales)):
+            attr = f.scale_rot_attr
+            attr.x, attr.y = scale
+            if align_flags == TCFLAG_ALIGN_LOCKED:
+                attr = f.lock_uaxis_attr
+                attr.x, attr.y, attr.z = uaxis
+                attr = f.lock_vaxis_attr
+                attr.x, attr.y, attr.z = vaxis
+            attr = f.shift_flags_attr
+            attr.x, attr.y = shift
+            attr.z = float((f.flags & keep_flags) | align_flags)
 
     # See header for locked_transform
     def locked_transform_one_face(self, f, translation, rs_mat, saved_normal):
+        self.modified = True
         # Initially use old normal for finding existing uvaxes
         new_normal = f.normal # Already in obj or world space, depending on f.world_space
         f.normal = saved_normal
@@ -2141,66 +2875,27 @@ class NailMesh:
     # one of the normal modes which makes future texture projection more likely to
     # do "what the user expects"(TM).
     def set_face_uv_axes(self, f, uaxis, vaxis):
-        flags = f.flags
-
-        # Validate axes
-        valid = True
-        u_len = uaxis.length_squared
-        v_len = vaxis.length_squared
-        if not isclose(u_len, 1):
-            if valid := not isclose(u_len, 0):
-                uaxis.normalize()
-        if valid and not isclose(v_len, 1):
-            if valid := not isclose(v_len, 0):
-                vaxis.normalize()
-
-        if valid:
-            # Check that the axes are orthogonal. Axes can become non-orthogonal
-            # if computed in object space on an object with non-uniform scale.
-            dot = uaxis.dot(vaxis)
-            if not isclose(dot, 0):
-                # Not orthogonal. Try to nudge the axes into being orthogonal.
-                bad = abs(dot) > 0.01
-                u = uaxis - dot * vaxis # u is orthogonal to vaxis
-                v = vaxis - dot * uaxis # v is orthogonal to uaxis
-                u.normalize()
-                v.normalize()
-                u = u.lerp(uaxis, 0.5)
-                v = v.lerp(vaxis, 0.5)
-                u.normalize()
-                v.normalize()
-                uaxis = u
-                vaxis = v
-                # I think the above should always compute orthogonal axes,
-                # but write an extra message in case it doesn't...
-                if not isclose(uaxis.dot(vaxis), 0):
-                    async_report_error( \
-                        "Nail computed invalid (non-orthogonal) UV axes, and failed to automatically correct it.\n" + \
-                        "Reverting to 'Axis' UV alignment. This can happen when using 'Object' Space Alignment on\n" + \
-                        "objects with non-uniform scale (scale is not the same on all X, Y, and Z). Avoid using\n" + \
-                        "non-uniform scale on NailMeshes, or use 'World' SpaceAlignment.", plsreport=False)
-                    valid = False
-                else:
-                    async_report_error(
-                        "Nail computed invalid (non-orthogonal) UV axes. This can happen when using 'Object' Space\n" + \
-                        "Alignment on objects with non-uniform scale (scale is not the same on all X, Y, and Z).\n" + \
-                        "Avoid using non-uniform scale on NailMeshes, or use 'World' Space Alignment.", plsreport=False)
+        self.set_face_validated_uv_axes(f, *validate_uv_axes(uaxis, vaxis))
+
+    # Same as set_face_uv_axes, for axes already checked by validate_uv_axes
+    def set_face_validated_uv_axes(self, f, uaxis, vaxis, valid):
+        # Runs per face, so the flags are updated with plain bit operations on
+        # the int (like in unpack_face_data) rather than set_flag/clear_flag.
+        # Both alignment bits are cleared, and then at most one is set again.
+        flags = f.flags & ~(TCFLAG_ALIGN_LOCKED | TCFLAG_ALIGN_FACE)
 
         aa_uaxis, aa_vaxis = self.get_axis_aligned_uv_axes(f)
         if not valid or (vec3_isclose(uaxis, aa_uaxis) and vec3_isclose(vaxis, aa_vaxis)):
             # Great news, the new axes are the same as axis-aligned mode! Switch to that
-            flags = clear_flag(flags, TCFLAG_ALIGN_LOCKED)
-            flags = clear_flag(flags, TCFLAG_ALIGN_FACE)
+            pass
         else:
             fa_uaxis, fa_vaxis = self.get_face_aligned_uv_axes(f)
             if vec3_isclose(uaxis, fa_uaxis) and vec3_isclose(vaxis, fa_vaxis):
                 # Same as face-aligned mode, slightly less great but still nice
-                flags = clear_flag(flags, TCFLAG_ALIGN_LOCKED)
-                flags = set_flag(flags, TCFLAG_ALIGN_FACE)
+                flags |= TCFLAG_ALIGN_FACE
             else:
                 # Ok need to use locked axes :(
-                flags = set_flag(flags, TCFLAG_ALIGN_LOCKED)
-                flags = clear_flag(flags, TCFLAG_ALIGN_FACE)
+                flags |= TCFLAG_ALIGN_LOCKED
                 # Save updated UV axes
                 f.lock_uaxis_attr.xyz = uaxis
                 f.lock_vaxis_attr.xyz = vaxis
@@ -2219,13 +2914,13 @@ class NailMesh:
             if f.align_face:
                 return self.get_face_aligned_uv_axes(f)
             else:
-                return self.get_axis_aligned_uv_axes(f)
+                # Same as get_axis_aligned_uv_axes, inlined since it's the most common case
+                return AXIS_ALIGNED_UV_AXES[face_orientation(f.normal)]
 
     # Axis-aligned mode is the same as a standard box projection.
     # (Expects f.normal to be set -- unpack_face_data calc_normal=True)
     def get_axis_aligned_uv_axes(self, f):
-        orientation = face_orientation(f.normal)
-        return (RIGHT_VECTORS[orientation], UP_VECTORS[orientation])
+        return AXIS_ALIGNED_UV_AXES[face_orientation(f.normal)]
 
     # Face-aligned mode is similar but takes rotation into account,
     # somewhat. It's a little weird but it's how Hammer does it!
@@ -2233,40 +2928,43 @@ class NailMesh:
     def get_face_aligned_uv_axes(self, f):
         orientation = face_orientation(f.normal)
         vaxis = UP_VECTORS[orientation]
-        uaxis = f.normal.cross(vaxis)
+        # The cross products are taken in the order that gives the negated u
+        # axis directly. uaxis is perpendicular to the (unit) normal, so vaxis
+        # comes out unit length without normalizing it again.
+        uaxis = vaxis.cross(f.normal)
         uaxis.normalize()
-        vaxis = uaxis.cross(f.normal)
-        vaxis.normalize()
-        uaxis.negate()
+        vaxis = f.normal.cross(uaxis)
         return (uaxis, vaxis)
 
     def unpack_face_data(self, face, calc_normal=True):
-        class NailFace:
-            pass
-
         shift_flags_attr = face[self.shift_flags_layer]
 
+        # This runs for every face, so the flag tests are written out as plain
+        # bit operations on the int rather than calls to flag_is_set.
         flags = int(shift_flags_attr.z)
-        if not flag_is_set(flags, TCFLAG_ENABLED):
+        if not flags & TCFLAG_ENABLED:
             return None
 
+        # The attribute proxies are kept in locals too, since reading them back
+        # from the NailFace slots is slower
         f = NailFace()
         f.shift_flags_attr = shift_flags_attr
-        f.scale_rot_attr = face[self.scale_rot_layer]
-        f.lock_uaxis_attr = face[self.lock_uaxis_layer]
-        f.lock_vaxis_attr = face[self.lock_vaxis_layer]
+        f.scale_rot_attr = scale_rot_attr = face[self.scale_rot_layer]
+        f.lock_uaxis_attr = lock_uaxis_attr = face[self.lock_uaxis_layer]
+        f.lock_vaxis_attr = lock_vaxis_attr = face[self.lock_vaxis_layer]
 
         # Initialize default (0,0,0) values to reasonable uv axes
-        if f.lock_uaxis_attr == VEC3_ATTR_DEFAULT:
-            f.lock_uaxis_attr.xyz = RIGHT_VECTORS[0]
-        if f.lock_vaxis_attr == VEC3_ATTR_DEFAULT:
-            f.lock_vaxis_attr.xyz = UP_VECTORS[0]
+        if lock_uaxis_attr == VEC3_ATTR_DEFAULT:
+            lock_uaxis_attr.xyz = RIGHT_VECTORS[0]
+        if lock_vaxis_attr == VEC3_ATTR_DEFAULT:
+            lock_vaxis_attr.xyz = UP_VECTORS[0]
 
         # Prevent scale from being 0 on either axis (also initializes for default values)
-        if isclose(f.scale_rot_attr.x, 0):
-            f.scale_rot_attr.x = 1
-        if isclose(f.scale_rot_attr.y, 0):
-            f.scale_rot_attr.y = 1
+        # (abs(x) <= 1e-5 is the same test as isclose(x, 0), without the call)
+        if abs(scale_rot_attr.x) <= 1e-5:
+            scale_rot_attr.x = 1
+        if abs(scale_rot_attr.y) <= 1e-5:
+            scale_rot_attr.y = 1
 
         # Note f.shift, f.scale, and f.rotation are only copies of the data
         # saved in the mesh attributes (accessing a Vector via the .xyzw
@@ -2274,14 +2972,14 @@ class NailMesh:
         # to them modifies the vector). To modify the actual saved values,
         # modify the f.***_attr variables directly.
         f.shift = shift_flags_attr.xy
-        f.scale = f.scale_rot_attr.xy
-        f.rotation = f.scale_rot_attr.z
+        f.scale = scale_rot_attr.xy
+        f.rotation = scale_rot_attr.z
 
         f.flags = flags
-        f.world_space = not flag_is_set(flags, TCFLAG_OBJECT_SPACE)
+        f.world_space = not flags & TCFLAG_OBJECT_SPACE
         # Note, align_face and align_locked are mutually exclusive
-        f.align_face = flag_is_set(flags, TCFLAG_ALIGN_FACE)
-        f.align_locked = flag_is_set(flags, TCFLAG_ALIGN_LOCKED)
+        f.align_face = (flags & TCFLAG_ALIGN_FACE) != 0
+        f.align_locked = (flags & TCFLAG_ALIGN_LOCKED) != 0
 
         # Calculate normal in advance since it's usually needed
         if calc_normal:
@@ -2304,41 +3002,67 @@ ORIENTATION_NX = 3  # -X
 ORIENTATION_NY = 4  # -Y
 ORIENTATION_NZ = 5  # -Z
 
+# Frozen, since they're shared by every face that uses them
 NORMAL_VECTORS = [
-    Vector((1,0,0)),  # +X
-    Vector((0,1,0)),  # +Y
-    Vector((0,0,1)),  # +Z
-    Vector((-1,0,0)), # -X
-    Vector((0,-1,0)), # -Y
-    Vector((0,0,-1)), # -Z
+    Vector((1,0,0)).freeze(),  # +X
+    Vector((0,1,0)).freeze(),  # +Y
+    Vector((0,0,1)).freeze(),  # +Z
+    Vector((-1,0,0)).freeze(), # -X
+    Vector((0,-1,0)).freeze(), # -Y
+    Vector((0,0,-1)).freeze(), # -Z
 ]
 
 UP_VECTORS = [
-    Vector((0,0,1)), # +X
-    Vector((0,0,1)), # +Y
-    Vector((0,1,0)), # +Z
-    Vector((0,0,1)), # -X
-    Vector((0,0,1)), # -Y
-    Vector((0,1,0)), # -Z
+    Vector((0,0,1)).freeze(), # +X
+    Vector((0,0,1)).freeze(), # +Y
+    Vector((0,1,0)).freeze(), # +Z
+    Vector((0,0,1)).freeze(), # -X
+    Vector((0,0,1)).freeze(), # -Y
+    Vector((0,1,0)).freeze(), # -Z
 ]
 
 RIGHT_VECTORS = [
-    Vector((0,-1,0)), # +X
-    Vector((-1,0,0)), # +Y
-    Vector((-1,0,0)), # +Z
-    Vector((0,-1,0)), # -X
-    Vector((-1,0,0)), # -Y
-    Vector((-1,0,0)), # -Z
+    Vector((0,-1,0)).freeze(), # +X
+    Vector((-1,0,0)).freeze(), # +Y
+    Vector((-1,0,0)).freeze(), # +Z
+    Vector((0,-1,0)).freeze(), # -X
+    Vector((-1,0,0)).freeze(), # -Y
+    Vector((-1,0,0)).freeze(), # -Z
 ]
 
+# The (uaxis, vaxis) pair of axis-aligned mode for each orientation, so that
+# looking them up is a single index. Face-aligned axes depend on the exact
+# normal, not just the orientation, so they can't be tabulated like this.
+AXIS_ALIGNED_UV_AXES = tuple((RIGHT_VECTORS[o], UP_VECTORS[o]) for o in range(6))
+
+# The vectors above packed into one contiguous (6,3,3) array, for computing
+# the UV axes of many faces at once with numpy. BASIS_MATRICES[orientation]
+# is the matrix with rows (right, up, -normal), so BASIS_MATRICES[o][:2]
+# projects a point onto the axis-aligned (u, v) axes of that orientation.
+# It's float64 (the entries are all exact) since the UV axes computed from it
+# are float64, so that gathering from it doesn't need a conversion too.
+BASIS_MATRICES = numpy.empty((6,3,3))
+for o in range(6):
+    BASIS_MATRICES[o, 0] = RIGHT_VECTORS[o]
+    BASIS_MATRICES[o, 1] = UP_VECTORS[o]
+    BASIS_MATRICES[o, 2] = -NORMAL_VECTORS[o]
+del o
+
+# Scalar version of face_orientation_bulk, for code working one face at a time.
+# Each component is read from the Vector only once. (Reading them as attributes
+# is faster than unpacking the Vector.) If x isn't the dominant axis, y beating
+# z is enough for y to be the dominant one.
 def face_orientation(v):
-    ax, ay, az = abs(v.x), abs(v.y), abs(v.z)
+    x = v.x
+    y = v.y
+    z = v.z
+    ax, ay, az = abs(x), abs(y), abs(z)
     if ax >= ay and ax >= az:
-        return ORIENTATION_PX if v.x >= 0 else ORIENTATION_NX
-    elif ay >= ax and ay >= az:
-        return ORIENTATION_PY if v.y >= 0 else ORIENTATION_NY
+        return ORIENTATION_PX if x >= 0 else ORIENTATION_NX
+    elif ay >= az:
+        return ORIENTATION_PY if y >= 0 else ORIENTATION_NY
     else:
-        return ORIENTATION_PZ if v.z >= 0 else ORIENTATION_NZ
+        return ORIENTATION_PZ if z >= 0 else ORIENTATION_NZ
 
 # For a normalized 3D vector, the largest of the values is the axis to which the
 # vector is most closely pointing, the dominant axis. The other two axes, the
@@ -2350,7 +3074,7 @@ def dominant_axis(v):
     ax, ay, az = abs(v[0]), abs(v[1]), abs(v[2])
     if ax >= ay and ax >= az:
         return (0, 1, 2)
-    elif ay >= ax and ay >= az:
+    elif ay >= az:
         return (1, 0, 2)
     else:
         return (2, 0, 1)
@@ -2372,6 +3096,64 @@ def isclose(a, b):
 def vec3_isclose(a, b):
     return isclose(a.x, b.x) and isclose(a.y, b.y) and isclose(a.z, b.z)
 
+# Elementwise isclose for numpy arrays. Unlike numpy.isclose, this is the same
+# symmetric test as math.isclose.
+def isclose_bulk(a, b):
+    return numpy.abs(a - b) <= numpy.maximum(1e-9 * numpy.maximum(numpy.abs(a), numpy.abs(b)), 1e-5)
+
+# vec3_isclose for each row of two (n,3) arrays
+def vec3_isclose_bulk(a, b):
+    return isclose_bulk(a, b).all(axis=1)
+
+# Validates UV axes for NailMesh.set_face_uv_axes, normalizing them (in place)
+# and nudging them to be orthogonal if needed. Returns (uaxis, vaxis, valid).
+# Doesn't depend on the face, so setting the same axes on many faces only
+# needs to do this once (see set_face_validated_uv_axes).
+def validate_uv_axes(uaxis, vaxis):
+    valid = True
+    u_len = uaxis.length_squared
+    v_len = vaxis.length_squared
+    if not isclose(u_len, 1):
+        if valid := not isclose(u_len, 0):
+            uaxis.normalize()
+    if valid and not isclose(v_len, 1):
+        if valid := not isclose(v_len, 0):
+            vaxis.normalize()
+
+    if valid:
+        # Check that the axes are orthogonal. Axes can become non-orthogonal
+        # if computed in object space on an object with non-uniform scale.
+        dot = uaxis.dot(vaxis)
+        if not isclose(dot, 0):
+            # Not orthogonal. Try to nudge the axes into being orthogonal.
+            bad = abs(dot) > 0.01
+            u = uaxis - dot * vaxis # u is orthogonal to vaxis
+            v = vaxis - dot * uaxis # v is orthogonal to uaxis
+            u.normalize()
+            v.normalize()
+            u = u.lerp(uaxis, 0.5)
+            v = v.lerp(vaxis, 0.5)
+            u.normalize()
+            v.normalize()
+            uaxis = u
+            vaxis = v
+            # I think the above should always compute orthogonal axes,
+            # but write an extra message in case it doesn't...
+            if not isclose(uaxis.dot(vaxis), 0):
+                async_report_error( \
+                    "Nail computed invalid (non-orthogonal) UV axes, and failed to automatically correct it.\n" + \
+                    "Reverting to 'Axis' UV alignment. This can happen when using 'Object' Space Alignment on\n" + \
+                    "objects with non-uniform scale (scale is not the same on all X, Y, and Z). Avoid using\n" + \
+                    "non-uniform scale on NailMeshes, or use 'World' SpaceAlignment.", plsreport=False)
+                valid = False
+            else:
+                async_report_error(
+                    "Nail computed invalid (non-orthogonal) UV axes. This can happen when using 'Object' Space\n" + \
+                    "Alignment on objects with non-uniform scale (scale is not the same on all X, Y, and Z).\n" + \
+                    "Avoid using non-uniform scale on NailMeshes, or use 'World' Space Alignment.", plsreport=False)
+
+    return (uaxis, vaxis, valid)
+
 def vec3_is_zero(v):
     return isclose(v.x, 0) and isclose(v.y, 0) and isclose(v.z, 0)
 
@@ -2381,7 +3163,7 @@ def vec3_is_zero(v):
 #    frac( 0.2) = 0.2
 #    frac(-0.2) = 0.8
 def frac(f):
-    return f - math.floor(f)
+    return f % 1.0
 
 # Like frac but returns values in the range -1 < out < 1 . In particular, if
 # the result has the same sign as the input. This can result in slightly more
@@ -2395,6 +3177,10 @@ def frac_n1to1(f):
     # to be converted to normal positive zero.
     return math.copysign(x, f) + 0
 
+# frac_n1to1 for every element of a numpy array
+def frac_n1to1_bulk(a):
+    return numpy.copysign(numpy.abs(a) % 1.0, a) + 0
+
 # Applies a matrix (pre-separated into 3x3 rotation+scale matrix and translation
 # vector) to shift, scale, and pre-normalized uaxis and vaxis vectors. Modifies
 # the shfit and scale inputs. Does not modify uaxis or vaxis; returns new uvaxis
@@ -2432,6 +3218,147 @@ def transform_uvaxis_shift_scale_by_matrix(uaxis, vaxis, shift, scale, rotation_
 
     return (uaxis, vaxis)
 
+# Same as transform_uvaxis_shift_scale_by_matrix, but for many faces at once.
+# uaxes and vaxes are (N,3) numpy arrays, shifts and scales are (N,2) numpy
+# arrays. rotation_scale_mat and translation are the same mathutils types as for
+# the single-face version, and apply to all N faces. Inputs are not modified;
+# returns new (uaxes, vaxes, shifts, scales) arrays.
+def transform_uvaxes_shift_scale_by_matrix_bulk(uaxes, vaxes, shifts, scales, rotation_scale_mat, translation):
+    if not rotation_scale_mat.is_identity:
+        m = numpy.array(rotation_scale_mat.to_3x3())
+        uaxes = uaxes @ m.T
+        vaxes = vaxes @ m.T
+
+        ulen = numpy.linalg.norm(uaxes, axis=1)
+        vlen = numpy.linalg.norm(vaxes, axis=1)
+        scales = scales * numpy.stack((ulen, vlen), axis=1)
+
+        # Like Vector.normalize, leave zero-length axes as they are
+        uaxes = numpy.divide(uaxes, ulen[:,None], out=uaxes, where=(ulen[:,None] != 0))
+        vaxes = numpy.divide(vaxes, vlen[:,None], out=vaxes, where=(vlen[:,None] != 0))
+
+    t = numpy.array(translation)
+    offsets = numpy.stack((uaxes @ t, vaxes @ t), axis=1)
+    offsets /= scales
+    shifts = frac_n1to1_bulk(shifts - offsets)
+
+    return (uaxes, vaxes, shifts, scales)
+
+# Vectorized face_orientation, for an (n,3) array of vectors
+def face_orientation_bulk(normals):
+    # argmax picks the first of equal values, which matches face_orientation
+    axis = numpy.argmax(numpy.abs(normals), axis=1)
+    negative = normals[numpy.arange(len(normals)), axis] < 0
+    return axis + negative * 3
+
+# Vectorized NailMesh.get_face_uv_axes, for n faces with the given (n,3) normals
+# (already in the face's space), TCFLAG flags, and saved locked UV axes.
+def face_uv_axes_bulk(normals, flags, lock_uaxes, lock_vaxes):
+    # Every face uses exactly one of the three alignment modes, so rather than
+    # computing every mode for every face and then picking, the faces are
+    # split up by mode and each mode's axes are only computed for its faces.
+
+    # Locked (takes precedence, like in get_face_uv_axes)
+    uaxes = lock_uaxes.astype(numpy.float64)
+    vaxes = lock_vaxes.astype(numpy.float64)
+    computed = (flags & TCFLAG_ALIGN_LOCKED) == 0
+    if not computed.any():
+        return (uaxes, vaxes)
+    normals = normals[computed]
+    orientation = face_orientation_bulk(normals)
+
+    # Axis-aligned, both axes gathered with one fancy index (which copies, so
+    # u and v can be modified below)
+    uv = BASIS_MATRICES[orientation,:2]
+    u = uv[:,0]
+    v = uv[:,1]
+
+    # Face-aligned
+    align_face = (flags[computed] & TCFLAG_ALIGN_FACE) != 0
+    if align_face.any():
+        n = normals[align_face]
+        # Same cross product order as get_face_aligned_uv_axes (no second normalize)
+        face_u = normalized_bulk(numpy.cross(v[align_face], n))
+        u[align_face] = face_u
+        v[align_face] = numpy.cross(n, face_u)
+
+    uaxes[computed] = u
+    vaxes[computed] = v
+    return (uaxes, vaxes)
+
+# Vectorized validate_uv_axes followed by the choice of alignment mode in
+# NailMesh.set_face_validated_uv_axes, for n faces with the given (n,3) normals
+# (the same as f.normal) and new (n,3) UV axes. Returns the validated axes and
+# each face's new alignment flags: 0 (axis-aligned), TCFLAG_ALIGN_FACE, or
+# TCFLAG_ALIGN_LOCKED, in which case the returned axes are the ones to save.
+def uv_axes_alignment_bulk(normals, uaxes, vaxes):
+    uaxes = uaxes.copy()
+    vaxes = vaxes.copy()
+    valid = numpy.ones(len(normals), bool)
+    u_len = (uaxes * uaxes).sum(axis=1)
+    fix = ~isclose_bulk(u_len, 1)
+    valid[fix] = ~isclose_bulk(u_len[fix], 0)
+    fix &= valid
+    uaxes[fix] /= numpy.sqrt(u_len[fix])[:,None]
+    v_len = (vaxes * vaxes).sum(axis=1)
+    fix = valid & ~isclose_bulk(v_len, 1)
+    valid[fix] = ~isclose_bulk(v_len[fix], 0)
+    fix &= valid
+    vaxes[fix] /= numpy.sqrt(v_len[fix])[:,None]
+    # Non-orthogonal axes (rare, see validate_uv_axes) are fixed up one by one
+    for i in numpy.flatnonzero(valid & ~isclose_bulk((uaxes * vaxes).sum(axis=1), 0)).tolist():
+        uaxis, vaxis, valid[i] = validate_uv_axes(Vector(uaxes[i]), Vector(vaxes[i]))
+        uaxes[i] = uaxis
+        vaxes[i] = vaxis
+
+    align = numpy.full(len(normals), TCFLAG_ALIGN_LOCKED)
+    aa = BASIS_MATRICES[face_orientation_bulk(normals),:2]
+    axis_aligned = ~valid | (vec3_isclose_bulk(uaxes, aa[:,0]) & vec3_isclose_bulk(vaxes, aa[:,1]))
+    align[axis_aligned] = 0
+    others = numpy.flatnonzero(~axis_aligned)
+    if len(others) != 0:
+        # Same as face_uv_axes_bulk's face-aligned axes
+        n = normals[others]
+        face_u = normalized_bulk(numpy.cross(aa[others,1], n))
+        face_v = numpy.cross(n, face_u)
+        face_aligned = vec3_isclose_bulk(uaxes[others], face_u) & vec3_isclose_bulk(vaxes[others], face_v)
+        align[others[face_aligned]] = TCFLAG_ALIGN_FACE
+    return (uaxes, vaxes, align)
+
+# Like Vector.normalized for each row of an (n,3) array. Zero-length rows are left as is.
+def normalized_bulk(v):
+    length = numpy.linalg.norm(v, axis=1)[:,None]
+    return numpy.divide(v, length, out=v.copy(), where=(length != 0))
+
+# Computes the UVs of a set of loops, like the loop in apply_texture_one_face.
+# Each loop uses the (2,4) affine map of its face f:
+#   uv = (affine[f,0,:3] . co + affine[f,0,3], affine[f,1,:3] . co + affine[f,1,3])
+# verts is the (V,3) vertex coordinates, loop_vert is the vertex index of each
+# loop, with the loops of each face following each other, loop_total is the
+# number of loops of each face, and affine is (F,2,4). Optionally, UVs are
+# snapped to snap[f] (F,2) steps per UV unit (0 for none), and then with wrap,
+# each face is wrapped so the UV of its first loop is in [0,1).
+# Returns an (L,2) array of UVs.
+def project_uvs(verts, loop_vert, loop_total, affine, snap=None, wrap=False):
+    # With homogeneous coordinates (x, y, z, 1), applying each loop's affine map
+    # (offsets included) is a single batched matrix-vector product, done in one
+    # einsum. Since a face's loops are consecutive, the per-face maps are spread
+    # out to the loops with repeat, which is cheaper than a fancy-index gather.
+    co = numpy.ones((len(loop_vert), 4))
+    co[:,:3] = verts[loop_vert]
+    uvs = numpy.einsum('lij,lj->li', numpy.repeat(affine, loop_total, axis=0), co)
+
+    if snap is not None:
+        snap = numpy.repeat(snap, loop_total, axis=0)
+        snapped = snap > 0
+        uvs[snapped] = numpy.round(uvs[snapped] * snap[snapped]) / snap[snapped]
+
+    if wrap:
+        first_loop = numpy.cumsum(loop_total) - loop_total
+        uvs -= numpy.repeat(numpy.floor(uvs[first_loop]), loop_total, axis=0)
+
+    return uvs
+
 def repr_flags(f):
     return f"{f:04b}" if f is not None else "None"
 
@@ -2446,24 +3373,72 @@ def set_or_apply_selected_faces(tc, context, set=False, edgealign=False, apply=F
 
         if ok:
             with NailMesh(obj) as nm:
-                if set:
-                    nm.set_texture_config(tc)
-                elif edgealign:
-                    nm.edge_align(tc)
-                if apply:
-                    nm.apply_texture()
-
+                # Find the selected faces once, for both setting and applying
+                faces = nm.get_faces()
+                if set and apply:
+                    nm.set_and_apply_texture_config(tc, faces=faces)
+                elif set:
+                    nm.set_texture_config(tc, faces=faces)
+                else:
+                    if edgealign:
+                        nm.edge_align(tc, faces=faces)
+                    if apply:
+                        nm.apply_texture(faces=faces)
+
+# Reads a per-face FLOAT_VECTOR attribute straight out of a Mesh into an (n,3)
+# numpy array, without going through a BMesh. foreach_get copies directly into
+# the array's buffer, which avoids creating a Python float per component like
+# a list would. Not valid in edit mode, since the Mesh data is stale then.
+def get_face_vec3_array(me, attr_name):
+    a = numpy.empty((len(me.polygons), 3), numpy.float32)
+    me.attributes[attr_name].data.foreach_get("vector", a.ravel())
+    return a
+
+# Like get_face_vec3_array, but reads a BMesh face layer of the given BMFaces.
+# Used in edit mode, where the Mesh attribute data is stale. numpy.fromiter over
+# the chained components is several times faster than numpy.array on a list of
+# Vectors, which has to treat each Vector as a generic sequence.
+def get_bmesh_face_vec3_array(faces, layer):
+    return numpy.fromiter(chain.from_iterable(face[layer] for face in faces),
+                          numpy.float32, 3 * len(faces)).reshape(-1, 3)
+
+# Stacks n rows of width floats each (Vectors or tuples) into an (n,width)
+# float64 array, with the same numpy.fromiter trick as get_bmesh_face_vec3_array.
+def stack_rows(rows, n, width):
+    return numpy.fromiter(chain.from_iterable(rows), numpy.float64, width * n).reshape(n, width)
+
+# Iterates over the rows of an (n,width) array as tuples of Python floats.
+# Unlike a.tolist(), this doesn't create a list for every row up front; with
+# that many new container objects alive at once, Python's cyclic garbage
+# collector kept running while they were being created.
+def iter_rows(a):
+    return zip(*[iter(a.ravel().tolist())] * a.shape[1])
+
+def set_face_vec3_array(me, attr_name, a):
+    me.attributes[attr_name].data.foreach_set("vector", a.ravel())
+
+# Returns True if any face of the mesh has Nail enabled. Must not be in editmode.
+# If the mesh doesn't have the Nail attributes (yet), returns True so that the
+# caller still goes through the normal NailMesh path.
+def mesh_has_any_nail_faces(me):
+    attr = me.attributes.get("Nail_ShiftFlags")
+    if attr is None or attr.domain != 'FACE' or attr.data_type != 'FLOAT_VECTOR':
+        return True
+    return bool((get_face_flags(me) & TCFLAG_ENABLED).any())
+
+# Returns the TCFLAG bits of every face of the mesh as a numpy uint8 array, so
+# flags can be tested for all faces at once, e.g. `flags & TCFLAG_ENABLED`.
+# The flags stay stored in the z lane of Nail_ShiftFlags (so existing files and
+# older versions of Nail keep working); they're only unpacked here. The mesh must
+# be a NailMesh and not in editmode.
+def get_face_flags(me):
+    return get_face_vec3_array(me, "Nail_ShiftFlags")[:,2].astype(numpy.uint8)
+
+# In edit mode, Mesh.total_face_sel is the edit BMesh's own count of selected
+# faces, so this doesn't need to look at the faces at all. (The Mesh's polygon
+# data, which foreach_get would read, is stale in edit mode.)
 def mesh_has_any_selected_faces(me): # must be in editmode
-    bm = bmesh.from_edit_mesh(me)
-    try:
-        if bm.faces.active is not None and bm.faces.active.select:
-            return True
-        for face in bm.faces:
-            if face.select:
-                return True
-    finally:
-        bm.free()
-    return False
+    return me.total_face_sel > 0
 
 def flag_is_set(a, b):
     return (int(a) & int(b)) == int(b)
@@ -2496,9 +3471,10 @@ def set_handler_enabled(handler_list, func, enable):
         if func in handler_list:
             handler_list.remove(func)
 
-def no_except(func, silent=False):
+# Calls func(*args), printing (unless silent) rather than raising any exception
+def no_except(func, *args, silent=False):
     try:
-        func()
+        func(*args)
     except Exception as e:
         if not silent:
             print("Error in Nail addon:")
@@ -2532,20 +3508,30 @@ def compute_pivot_point(pivot_mode = None):
     if pivot_mode is None:
         pivot_mode = bpy.context.scene.tool_settings.transform_pivot_point
 
+    # Returns the world-space coordinates of all selected verts as an (n,3)
+    # numpy array. Each object's selected coordinates are gathered first and
+    # then transformed to world space all at once, rather than one Vector at
+    # a time.
+    #
+    # The edit BMeshes aren't freed here. from_edit_mesh hands out the same
+    # Python BMesh as everything else using the edit mesh (e.g. an open
+    # NailMesh), and freeing it would invalidate it for all of them.
     def get_selected_verts():
-        vert_coords = []
+        vert_coords = [numpy.empty((0, 3))]
         for obj in bpy.context.objects_in_mode:
-            if obj.type == 'MESH' and obj.data.is_editmode:
+            # Mesh.total_vert_sel is kept up to date in edit mode, so objects
+            # with nothing selected don't need their verts looked at at all
+            if obj.type == 'MESH' and obj.data.is_editmode and obj.data.total_vert_sel > 0:
                 bm = bmesh.from_edit_mesh(obj.data)
                 if bm.select_mode != {'FACE'}:
                     raise NotImplementedError("compute_pivot_point needs face selection mode")
-                object_to_world = obj.matrix_world
-                for v in bm.verts:
-                    if v.select:
-                        world_co = object_to_world @ v.co
-                        vert_coords.append(world_co.to_tuple())
-                bm.free()
-        return vert_coords
+                object_to_world = numpy.array(obj.matrix_world)
+                # (The Mesh's own vertex data is stale in edit mode, so it can't be
+                # read with foreach_get)
+                co = numpy.fromiter(chain.from_iterable(v.co for v in bm.verts if v.select),
+                                    numpy.float64).reshape(-1, 3)
+                vert_coords.append(co @ object_to_world[:3,:3].T + object_to_world[:3,3])
+        return numpy.concatenate(vert_coords)
 
     if pivot_mode == 'BOUNDING_BOX_CENTER':
         vert_coords = get_selected_verts()
@@ -2589,7 +3575,6 @@ def compute_pivot_point(pivot_mode = None):
             if bm.faces.active is not None:
                 object_to_world = obj.matrix_world
                 pos = object_to_world @ bm.faces.active.calc_center_median()
-            bm.free()
         if pos is None:
             # If there is no active face, Blender uses the median point
             return compute_pivot_point(pivot_mode='MEDIAN_POINT')
@@ -2614,15 +3599,27 @@ from gpu_extras.batch import batch_for_shader
 draw_handler = None
 coords = []
 coords_color = []
-shader = gpu.shader.from_builtin('FLAT_COLOR')
+shader = None # Created by enable_debug_draw; compiling it at import slows down addon loading
 batch = None
+# The coords and colors the current batch was built from
+batch_coords = None
+batch_coords_color = None
 
 did_draw = False
 vec_changed = False
 
-# Finds one arbitrary orthogonal vector to v (must be normalized)
+# Finds one arbitrary orthogonal vector to v (must be normalized). Starts from
+# the coordinate axis along v's smallest component, which is never closer than
+# about 55 degrees to v, so removing the v component never leaves a tiny vector
+# to normalize (unlike starting from a fixed vector, which v might point along).
 def find_orthogonal(v):
-    r = Vector((0.5407058596611023, 0.642538845539093, 0.5429373383522034)) # random normalized
+    ax, ay, az = abs(v.x), abs(v.y), abs(v.z)
+    if ax <= ay and ax <= az:
+        r = Vector((1, 0, 0))
+    elif ay <= az:
+        r = Vector((0, 1, 0))
+    else:
+        r = Vector((0, 0, 1))
     r -= r.dot(v) * v
     return r.normalized()
 
@@ -2669,41 +3666,92 @@ def debug_draw_vec(origin, direction, color):
         et, a3.to_tuple(),
         et, a4.to_tuple()])
 
-    c = color
-    coords_color.extend([c,c, c,c, c,c, c,c, c,c])
+    coords_color.extend([color] * 10)
+
+# Same as debug_draw_vec for each row of the (n,3) origins and directions
+# arrays, with all the arrows worked out at once with numpy rather than with a
+# dozen Vectors each.
+def debug_draw_vecs_bulk(origins, directions, color):
+    global vec_changed
+
+    if did_draw:
+        reset_debug_vectors()
+
+    vec_changed = True
+    length = numpy.linalg.norm(directions, axis=1)[:,None]
+    dn = normalized_bulk(directions)
+
+    # find_orthogonal for each row. argmin picks the first of equal values,
+    # which matches its comparisons.
+    r = numpy.eye(3)[numpy.argmin(numpy.abs(dn), axis=1)]
+    o1 = normalized_bulk(r - (r * dn).sum(axis=1)[:,None] * dn)
+    o2 = numpy.cross(dn, o1)
+
+    axl = numpy.maximum(length-1, length*0.5)
+    al = (length-axl)*0.1
+    ax = origins + dn*axl
+    e = origins + directions
+
+    # Same order as debug_draw_vec: the main line, then the four arrow head lines
+    arrows = numpy.empty((len(origins), 10, 3))
+    arrows[:,0] = origins
+    arrows[:,1] = e
+    arrows[:,2:10:2] = e[:,None]
+    arrows[:,3] = ax + o1*al
+    arrows[:,5] = ax + o2*al
+    arrows[:,7] = ax - o1*al
+    arrows[:,9] = ax - o2*al
+    coords.extend(map(tuple, arrows.reshape(-1, 3).tolist()))
+
+    coords_color.extend([color] * (10 * len(origins)))
 
 def debug_draw_3dview():
     global did_draw
     global coords, coords_color
-    global batch
+    global batch, batch_coords, batch_coords_color
     global vec_changed
     global shader
     if len(coords) == 0:
         return
     if vec_changed:
-        batch = batch_for_shader(shader, 'LINES', {"pos": coords, "color": coords_color})
+        # The same vectors are often redrawn every frame (e.g. auto-apply on
+        # a face that isn't changing), so only rebuild and reupload the batch
+        # if they're actually different from the ones it was built from.
+        # (Refilling the old batch's GPUVertBuf with attr_fill instead isn't an
+        # option: once a vertex buffer is uploaded, Blender drops its CPU-side
+        # copy, and the number of vertices usually changes anyway.)
+        if batch is None or coords != batch_coords or coords_color != batch_coords_color:
+            batch = batch_for_shader(shader, 'LINES', {"pos": coords, "color": coords_color})
+            batch_coords = coords
+            batch_coords_color = coords_color
         vec_changed = False
     batch.draw(shader)
     did_draw = True
 
+# The batch is kept, so it can be reused if the same vectors are drawn again
 def reset_debug_vectors():
-    global coords, coords_color, did_draw, vec_changed, batch
+    global coords, coords_color, did_draw, vec_changed
     coords = []
     coords_color = []
     did_draw = False
     vec_changed = False
-    batch = None
 
 def enable_debug_draw():
     global draw_handler
+    global shader
     disable_debug_draw()
+    if shader is None:
+        shader = gpu.shader.from_builtin('FLAT_COLOR')
     draw_handler = bpy.types.SpaceView3D.draw_handler_add(debug_draw_3dview, (), 'WINDOW', 'POST_VIEW')
 
 def disable_debug_draw():
-    global draw_handler
+    global draw_handler, batch, batch_coords, batch_coords_color
     reset_debug_vectors()
+    batch = None
+    batch_coords = None
+    batch_coords_color = None
     if draw_handler is not None:
-        no_except(lambda: bpy.types.SpaceView3D.draw_handler_remove(draw_handler, 'WINDOW'), silent=True)
+        no_except(bpy.types.SpaceView3D.draw_handler_remove, draw_handler, 'WINDOW', silent=True)
         draw_handler = None
 
 